@@ -0,0 +1,262 @@
+import argparse
+import gc
+import inspect
+import json
+import math
+import statistics
+import sys
+import threading
+from collections import namedtuple
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from time import perf_counter
+
+
+_gc_lock = threading.Lock()
+_gc_suspensions = 0  # gc_suspended blocks currently open, in any thread
+_gc_was_enabled = False
+
+
+@contextmanager
+def gc_suspended():
+    """Switches the garbage collector off for the duration of the block.
+
+    The collector state is global to the process, so nested or concurrent
+    blocks share a counter: the first one to enter collects and disables
+    it, and only the last one to exit restores the state it found.
+    """
+    global _gc_suspensions, _gc_was_enabled
+    with _gc_lock:
+        if not _gc_suspensions:
+            _gc_was_enabled = gc.isenabled()
+            gc.collect()
+            gc.disable()
+        _gc_suspensions += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_suspensions -= 1
+            if not _gc_suspensions and _gc_was_enabled:
+                gc.enable()
+
+
+class BenchmarkResult:
+    """Per-loop timings, in seconds, collected for one benchmarked callable"""
+    def __init__(self, name, samples, loops, return_value=None):
+        self.name = name
+        self.samples = list(samples)
+        self.loops = loops
+        self.return_value = return_value
+
+    @property
+    def mean(self):
+        return statistics.fmean(self.samples)
+
+    @property
+    def median(self):
+        return statistics.median(self.samples)
+
+    @property
+    def stdev(self):
+        if len(self.samples) < 2:
+            return 0.0
+        return statistics.stdev(self.samples)
+
+    @property
+    def min(self):
+        return min(self.samples)
+
+    @property
+    def max(self):
+        return max(self.samples)
+
+    def percentile(self, p):
+        """Linearly interpolated percentile, with p between 0 and 100"""
+        if not 0 <= p <= 100:
+            raise ValueError(f'Percentile must be between 0 and 100, got {p}.')
+        ordered = sorted(self.samples)
+        rank = (len(ordered) - 1) * p / 100
+        lo, hi = math.floor(rank), math.ceil(rank)
+        return ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'loops': self.loops,
+            'samples': self.samples,
+            'mean': self.mean,
+            'median': self.median,
+            'stdev': self.stdev,
+            'min': self.min,
+            'max': self.max,
+            'p5': self.percentile(5),
+            'p95': self.percentile(95),
+        }
+
+    @classmethod
+    def fromdict(cls, d):
+        return cls(d['name'], d['samples'], d['loops'])
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(name={self.name!r}, '
+                f'median={self.median:.3e}, stdev={self.stdev:.3e}, '
+                f'trials={len(self.samples)}, loops={self.loops})')
+
+
+class Benchmark:
+    """Times f(*args, **kwargs) over several trials of `loops` calls each.
+
+    Warm-up calls run before timing, the loop count is calibrated so that a
+    trial lasts at least `min_time` seconds unless `loops` is given, and the
+    garbage collector is switched off while timing when `disable_gc` is set.
+    """
+    def __init__(self, f, args=(), kwargs=None, *, name=None, trials=5,
+                 warmup=1, loops=None, min_time=0.01, disable_gc=True):
+        if trials < 1:
+            raise ValueError(f'Need at least one trial, got {trials}.')
+        self.f = f
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.name = name or getattr(f, '__qualname__', repr(f))
+        self.trials = trials
+        self.warmup = warmup
+        self.loops = loops
+        self.min_time = min_time
+        self.disable_gc = disable_gc
+
+    def _time(self, loops):
+        f, args, kwargs = self.f, self.args, self.kwargs
+        start = perf_counter()
+        for _ in range(loops):
+            f(*args, **kwargs)
+        return perf_counter() - start
+
+    def calibrate(self):
+        """Smallest power of ten loop count that runs for at least min_time"""
+        loops = 1
+        while True:
+            if self._time(loops) >= self.min_time or loops >= 10 ** 9:
+                return loops
+            loops *= 10
+
+    def run(self):
+        f, args, kwargs = self.f, self.args, self.kwargs
+        return_value = None
+        for _ in range(self.warmup):
+            return_value = f(*args, **kwargs)
+        with gc_suspended() if self.disable_gc else nullcontext():
+            loops = self.loops or self.calibrate()
+            samples = [self._time(loops) / loops for _ in range(self.trials)]
+        if not self.warmup:
+            return_value = f(*args, **kwargs)
+        return BenchmarkResult(self.name, samples, loops, return_value)
+
+    # coroutine functions are awaited one call at a time, inside the running event loop
+    async def _time_async(self, loops):
+        f, args, kwargs = self.f, self.args, self.kwargs
+        start = perf_counter()
+        for _ in range(loops):
+            await f(*args, **kwargs)
+        return perf_counter() - start
+
+    async def calibrate_async(self):
+        loops = 1
+        while True:
+            if await self._time_async(loops) >= self.min_time or loops >= 10 ** 9:
+                return loops
+            loops *= 10
+
+    async def run_async(self):
+        """Awaits f(*args, **kwargs) like run calls it.
+
+        The timings are wall-clock time between the start and the end of
+        each await, so they include the time other tasks of the event loop
+        run while f is suspended. With disable_gc, the collector stays off
+        for those tasks too until the last overlapping benchmark finishes.
+        """
+        f, args, kwargs = self.f, self.args, self.kwargs
+        return_value = None
+        for _ in range(self.warmup):
+            return_value = await f(*args, **kwargs)
+        with gc_suspended() if self.disable_gc else nullcontext():
+            loops = self.loops or await self.calibrate_async()
+            samples = [await self._time_async(loops) / loops for _ in range(self.trials)]
+        if not self.warmup:
+            return_value = await f(*args, **kwargs)
+        return BenchmarkResult(self.name, samples, loops, return_value)
+
+
+def benchmark(trials=5, warmup=1, loops=None, min_time=0.01, disable_gc=True):
+    """Decorator that benchmarks every call and returns a BenchmarkResult.
+
+    The wrapped function's return value is kept in `result.return_value`.
+    Coroutine functions are wrapped in a coroutine function that awaits them.
+    """
+    def decorator(f):
+        def make(args, kwargs):
+            return Benchmark(
+                f, args, kwargs, trials=trials, warmup=warmup, loops=loops,
+                min_time=min_time, disable_gc=disable_gc)
+        if inspect.iscoroutinefunction(f):
+            @wraps(f)
+            async def inner_async(*args, **kwargs):
+                return await make(args, kwargs).run_async()
+            return inner_async
+
+        @wraps(f)
+        def inner(*args, **kwargs):
+            return make(args, kwargs).run()
+        return inner
+    return decorator
+
+
+def save_results(results, path):
+    with open(path, 'w') as fp:
+        json.dump({r.name: r.to_dict() for r in results}, fp, indent=2)
+
+
+def load_results(path):
+    with open(path) as fp:
+        return {name: BenchmarkResult.fromdict(d) for name, d in json.load(fp).items()}
+
+
+Comparison = namedtuple('Comparison', 'name baseline current ratio regressed')
+
+
+def compare(results, baseline, tolerance=0.1):
+    """Compares median timings against a baseline keyed by benchmark name.
+
+    A benchmark regressed when its median is more than `tolerance` slower,
+    as a fraction of the baseline median. Benchmarks missing from the
+    baseline are skipped.
+    """
+    if not isinstance(results, dict):
+        results = {r.name: r for r in results}
+    comparisons = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name].median, result.median
+        ratio = new / old if old else math.inf
+        comparisons.append(Comparison(name, old, new, ratio, ratio > 1 + tolerance))
+    return comparisons
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Compare saved benchmark results against a baseline.')
+    parser.add_argument('results')
+    parser.add_argument('baseline')
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    options = parser.parse_args(argv)
+    comparisons = compare(
+        load_results(options.results), load_results(options.baseline), options.tolerance)
+    for c in comparisons:
+        flag = 'REGRESSED' if c.regressed else 'ok'
+        print(f'{c.name:<40} {c.baseline:>12.3e} {c.current:>12.3e} {c.ratio:>7.2f}x  {flag}')
+    return 1 if any(c.regressed for c in comparisons) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Hash quality of the Vector classes on coordinate grids, against the old XOR hashes.
+
+Run from the fluent_python directory with `python -m benchmarks.hashing`.
+"""
+import argparse
+import sys
+from functools import reduce
+from itertools import product
+from operator import xor
+
+from benchmark import Benchmark
+from ch9.vector2d import Vector2d
+from ch10.vector import Vector as Vector10
+
+
+class XorVector2d(Vector2d):
+    """Vector2d with its former hash, hash(x) ^ hash(y)"""
+    __slots__ = ()
+
+    def __hash__(self):
+        return hash(self.x) ^ hash(self.y)
+
+
+class XorVector(Vector10):
+    """ch10 Vector with its former hash, the XOR of the component hashes"""
+    __slots__ = ()
+
+    def __hash__(self):
+        return reduce(xor, map(hash, self._components), 0)
+
+
+# label -> (factory taking the coordinates as a tuple, dimension)
+SCHEMES = {
+    'Vector2d xor': (lambda point: XorVector2d(*point), 2),
+    'Vector2d': (lambda point: Vector2d(*point), 2),
+    'Vector xor': (XorVector, 3),
+    'Vector': (Vector10, 3),
+}
+
+
+def grid(side, dimension, step=1.0):
+    """Every point of a square (or cubic) grid with side points along each axis"""
+    return list(product([i * step for i in range(side)], repeat=dimension))
+
+
+def collision_rates(vectors):
+    """Fraction of vectors that share their hash, and their dict slot, with an earlier one"""
+    hashes = list(map(hash, vectors))
+    n = len(hashes)
+    mask = (1 << (2 * n).bit_length()) - 1  # about the table size of a dict of n keys
+    return 1 - len(set(hashes)) / n, 1 - len({h & mask for h in hashes}) / n
+
+
+def run_suite(side=100, step=1.0, schemes=None, trials=3):
+    """Rows of (label, hash collisions, slot collisions, insert seconds, lookup seconds)"""
+    rows = []
+    for label in schemes or SCHEMES:
+        make, dimension = SCHEMES[label]
+        points = grid(side if dimension == 2 else round(side ** (2 / 3)), dimension, step)
+        keys = [make(p) for p in points]
+        lookups = [make(p) for p in points]  # equal but distinct, with no cached hash
+        insert = Benchmark(dict.fromkeys, (keys,), name=f'{label}.insert', trials=trials, loops=1).run()
+        table = insert.return_value
+        lookup = Benchmark(lambda: [k in table for k in lookups], name=f'{label}.lookup',
+                           trials=trials, loops=1).run()
+        rows.append((label, *collision_rates(keys), insert.median, lookup.median, len(keys)))
+    return rows
+
+
+def format_rows(rows):
+    lines = [f'{"hash":<16}{"keys":>9}{"collisions":>12}{"slot coll.":>12}{"insert s":>12}{"lookup s":>12}']
+    for label, collisions, slot_collisions, insert, lookup, n in rows:
+        lines.append(f'{label:<16}{n:>9}{collisions:>12.2%}{slot_collisions:>12.2%}'
+                     f'{insert:>12.3e}{lookup:>12.3e}')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--side', type=int, default=100, help='points per axis of the 2d grid')
+    parser.add_argument('--step', type=float, default=1.0, help='distance between grid points')
+    parser.add_argument('--schemes', nargs='+', choices=list(SCHEMES))
+    parser.add_argument('--trials', type=int, default=3)
+    options = parser.parse_args(argv)
+    print(format_rows(run_suite(options.side, options.step, options.schemes, options.trials)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Recall and latency of ch10.similarity.LSHIndex against exact search.
+
+Run from the fluent_python directory with `python -m benchmarks.similarity`.
+"""
+import argparse
+import random
+import sys
+
+from benchmark import Benchmark
+from ch10.similarity import LSHIndex, exact_search, recall
+from ch10.vector import Vector
+
+
+DEFAULT_CONFIGS = [  # (n_tables, n_bits, probes)
+    (4, 16, 0), (8, 16, 0), (8, 16, 4), (16, 12, 0), (16, 12, 4),
+]
+
+
+def embeddings(n, dimension, n_clusters=100, spread=0.3, seed=0):
+    """Vectors scattered around random cluster centers, like real embeddings"""
+    rng = random.Random(seed)
+    centers = [[rng.gauss(0, 1) for _ in range(dimension)] for _ in range(n_clusters)]
+    return [Vector(c + rng.gauss(0, spread) for c in rng.choice(centers)) for _ in range(n)]
+
+
+def run_suite(n=20_000, dimension=128, n_queries=20, k=10, metric='cosine',
+              configs=DEFAULT_CONFIGS, bucket_width=16.0, trials=3):
+    """Rows of (name, recall, seconds per query)"""
+    vectors = embeddings(n + n_queries, dimension)
+    queries = vectors[n:]  # from the same clusters, but not indexed
+    del vectors[n:]
+
+    exact_bench = Benchmark(lambda: [exact_search(vectors, q, k, metric) for q in queries],
+                            name='exact', trials=trials, loops=1).run()
+    exact = exact_bench.return_value
+    rows = [('exact', 1.0, exact_bench.median / n_queries)]
+    for n_tables, n_bits, probes in configs:
+        index = LSHIndex(dimension, metric, n_tables, n_bits, bucket_width, seed=0)
+        index.extend(vectors)
+        result = Benchmark(index.query_many, (queries, k, probes), name='lsh',
+                           trials=trials, loops=1).run()
+        found = result.return_value
+        rows.append((f'lsh tables={n_tables} bits={n_bits} probes={probes}',
+                     sum(map(recall, found, exact)) / n_queries, result.median / n_queries))
+    return rows
+
+
+def format_rows(rows):
+    exact_time = rows[0][2]
+    lines = [f'{"search":<36}{"recall":>8}{"ms/query":>12}{"speedup":>10}']
+    for name, found, seconds in rows:
+        lines.append(f'{name:<36}{found:>8.3f}{seconds * 1e3:>12.3f}{exact_time / seconds:>9.1f}x')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=20_000)
+    parser.add_argument('--dimension', type=int, default=128)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--metric', choices=['cosine', 'euclidean'], default='cosine')
+    parser.add_argument('--bucket-width', type=float, default=16.0,
+                        help='euclidean metric only, about the distance between neighbors')
+    parser.add_argument('--trials', type=int, default=3)
+    options = parser.parse_args(argv)
+
+    rows = run_suite(options.n, options.dimension, options.queries, options.k, options.metric,
+                     bucket_width=options.bucket_width, trials=options.trials)
+    print(format_rows(rows))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Nearest-neighbor and radius queries: ch9.spatial.GridIndex against linear scans.
+
+Run from the fluent_python directory with `python -m benchmarks.spatial`.
+"""
+import argparse
+import random
+import sys
+
+from benchmark import Benchmark, save_results
+from ch9.spatial import GridIndex, linear_nearest, linear_within
+from ch9.vector2d import Vector2d
+
+from .vectors import format_table
+
+
+DEFAULT_POINTS = 10 ** 6
+DEFAULT_QUERIES = 10
+
+
+def random_points(n, seed=0, cls=Vector2d):
+    rng = random.Random(seed)
+    return [cls(rng.random(), rng.random()) for _ in range(n)]
+
+
+def run_suite(n_points=DEFAULT_POINTS, n_queries=DEFAULT_QUERIES, k=10, radius=0.01,
+              trials=3, loops=1):
+    """Median time of n_queries queries of each kind, per strategy"""
+    points = random_points(n_points)
+    centers = random_points(n_queries, seed=1)
+    build = Benchmark(GridIndex, (points,), name=f'grid.build[n={n_points}]', trials=1, loops=1)
+    build_result = build.run()
+    index = build_result.return_value
+    cases = {
+        f'linear.nearest[k={k}]': lambda: [linear_nearest(points, c, k) for c in centers],
+        f'grid.nearest[k={k}]': lambda: [index.nearest(c, k) for c in centers],
+        f'linear.within[r={radius}]': lambda: [linear_within(points, c, radius) for c in centers],
+        f'grid.within[r={radius}]': lambda: [index.within(c, radius) for c in centers],
+    }
+    results = [Benchmark(f, name=name, trials=trials, loops=loops).run()
+               for name, f in cases.items()]
+    return [build_result] + results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', type=int, default=DEFAULT_POINTS)
+    parser.add_argument('--queries', type=int, default=DEFAULT_QUERIES)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--radius', type=float, default=0.01)
+    parser.add_argument('--trials', type=int, default=3)
+    parser.add_argument('--save', help='write the results to this JSON file')
+    options = parser.parse_args(argv)
+
+    results = run_suite(options.points, options.queries, options.k, options.radius, options.trials)
+    print(format_table(results))
+    if options.save:
+        save_results(results, options.save)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,23 @@
+from ch9.vector2d import Vector2d
+
+from .hashing import XorVector2d, collision_rates, format_rows, grid, main, run_suite
+
+
+def test_grid():
+    assert grid(2, 2, step=0.5) == [(0.0, 0.0), (0.0, 0.5), (0.5, 0.0), (0.5, 0.5)]
+    assert len(grid(3, 3)) == 27
+
+
+def test_order_sensitive_hash_has_no_collisions_on_grids():
+    points = grid(30, 2)
+    assert collision_rates([Vector2d(*p) for p in points])[0] == 0.0
+    assert collision_rates([XorVector2d(*p) for p in points])[0] > 0.9
+
+
+def test_run_suite(capsys):
+    rows = run_suite(side=10, trials=1)
+    assert [row[0] for row in rows] == ['Vector2d xor', 'Vector2d', 'Vector xor', 'Vector']
+    assert rows[1][1] == rows[3][1] == 0.0
+    assert len(format_rows(rows).splitlines()) == 5
+    assert main(['--side', '5', '--trials', '1', '--schemes', 'Vector2d']) == 0
+    assert 'Vector2d' in capsys.readouterr().out
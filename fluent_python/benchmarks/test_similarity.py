@@ -0,0 +1,17 @@
+from .similarity import format_rows, main, run_suite
+
+
+def test_run_suite_reports_recall_and_latency():
+    rows = run_suite(n=300, dimension=16, n_queries=3, k=5, configs=[(4, 8, 0), (4, 8, 2)], trials=1)
+    assert [name for (name, _, _) in rows] == [
+        'exact', 'lsh tables=4 bits=8 probes=0', 'lsh tables=4 bits=8 probes=2']
+    assert rows[0][1] == 1.0
+    assert all(0.0 <= found <= 1.0 and seconds > 0 for (_, found, seconds) in rows)
+    assert rows[2][1] >= rows[1][1]
+    assert len(format_rows(rows).splitlines()) == 4
+
+
+def test_main(capsys):
+    assert main(['--n', '200', '--dimension', '8', '--queries', '2', '--trials', '1',
+                 '--metric', 'euclidean']) == 0
+    assert 'recall' in capsys.readouterr().out
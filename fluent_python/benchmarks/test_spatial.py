@@ -0,0 +1,15 @@
+from .spatial import main, run_suite
+
+
+def test_run_suite_times_both_strategies():
+    results = run_suite(n_points=500, n_queries=3, trials=1)
+    names = [r.name for r in results]
+    assert names == ['grid.build[n=500]', 'linear.nearest[k=10]', 'grid.nearest[k=10]',
+                     'linear.within[r=0.01]', 'grid.within[r=0.01]']
+    nearest = {r.name.split('.')[0]: r.return_value for r in results[1:3]}
+    assert nearest['grid'] == nearest['linear']
+
+
+def test_main(capsys):
+    assert main(['--points', '200', '--queries', '2', '--trials', '1']) == 0
+    assert 'grid' in capsys.readouterr().out
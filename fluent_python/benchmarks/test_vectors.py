@@ -0,0 +1,37 @@
+from ch13.vector import Vector
+from .vectors import VECTOR_CLASSES, format_table, main, run_suite, single_cases
+
+
+def test_run_suite_covers_every_class_and_operation():
+    results = run_suite(sizes=[2, 3], batch_size=10, trials=1, loops=1)
+    names = {r.name for r in results}
+    assert 'ch9.Vector2d.abs[n=2]' in names
+    assert 'ch9.Vector2d.frombytes[batch=10]' in names
+    assert 'ch10.Vector.shortcut[n=3]' in names
+    assert 'ch13.Vector.add[n=3]' in names
+    assert 'ch13.Vector.hash[batch=10]' in names
+    assert all(len(r.samples) == 1 for r in results)
+
+
+def test_format_table_has_a_column_per_class():
+    results = run_suite(sizes=[2], batch_size=0, trials=1, loops=1)
+    header, *rows = format_table(results).splitlines()
+    assert header.split()[1:] == list(VECTOR_CLASSES)
+    assert any(row.startswith('add[n=2]') for row in rows)
+
+
+def test_main_compares_against_baseline(tmp_path, capsys):
+    path = str(tmp_path / 'baseline.json')
+    args = ['--sizes', '2', '--batch-size', '0', '--trials', '1', '--classes', 'ch13.Vector']
+    assert main(args + ['--save', path]) == 0
+    assert main(args + ['--baseline', path, '--tolerance', '1000']) == 0
+    assert 'ch13.Vector' in capsys.readouterr().out
+
+
+def test_abs_and_hash_are_recomputed_on_every_call():
+    cases = single_cases(Vector, Vector, 3)
+    for op, expected in [('abs', abs(Vector([0, 1, 2]))), ('hash', hash(Vector([0, 1, 2])))]:
+        f, (v,) = cases[op]
+        f(v)
+        v._hash, v._norm = -1, -1.0  # stale values a cache hit would return
+        assert f(v) == expected
@@ -0,0 +1,137 @@
+"""Benchmarks for the hot paths of the Vector classes in ch9, ch10 and ch13.
+
+Run from the fluent_python directory with `python -m benchmarks.vectors`.
+"""
+import argparse
+import operator
+import sys
+from operator import attrgetter
+
+from benchmark import Benchmark, compare, load_results, save_results
+from ch9.vector2d import Vector2d
+from ch10.vector import Vector as Vector10
+from ch13.vector import Vector as Vector13
+
+
+DEFAULT_SIZES = [2, 10, 100, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+DEFAULT_BATCH_SIZE = 10 ** 5
+
+# label -> (factory taking a list of components, supports variable size)
+VECTOR_CLASSES = {
+    'ch9.Vector2d': (lambda components: Vector2d(*components), False),
+    'ch10.Vector': (Vector10, True),
+    'ch13.Vector': (Vector13, True),
+}
+
+
+def _components(size, offset=0.0):
+    return [float(i) + offset for i in range(size)]
+
+
+def _uncached(f):
+    """f(v), after dropping the hash and norm that v may have cached, so that
+    every call times the computation instead of a cache hit"""
+    def call(v):
+        try:
+            v._hash = v._norm = None
+        except AttributeError:  # Vector2d caches neither
+            pass
+        return f(v)
+    return call
+
+
+def single_cases(cls, make, size):
+    """Operation name -> (callable, args) acting on one vector of `size` components"""
+    v, w = make(_components(size)), make(_components(size))
+    cases = {
+        'abs': (_uncached(abs), (v,)),
+        'hash': (_uncached(hash), (v,)),
+        'eq': (operator.eq, (v, w)),
+        'frombytes': (cls.frombytes, (bytes(v),)),
+        'shortcut': (attrgetter('x'), (v,)),
+    }
+    if hasattr(cls, '__add__'):
+        cases['add'] = (operator.add, (v, w))
+    return cases
+
+
+def batch_cases(cls, make, n, size=2):
+    """Operation name -> (callable, args) applied over a batch of n small vectors"""
+    vs = [make(_components(size, i)) for i in range(n)]
+    ws = [make(_components(size, i)) for i in range(n)]
+    octets = [bytes(v) for v in vs]
+    cases = {
+        'abs': (lambda: list(map(_uncached(abs), vs)), ()),
+        'hash': (lambda: list(map(_uncached(hash), vs)), ()),
+        'eq': (lambda: list(map(operator.eq, vs, ws)), ()),
+        'frombytes': (lambda: list(map(cls.frombytes, octets)), ()),
+        'shortcut': (lambda: list(map(attrgetter('x'), vs)), ()),
+    }
+    if hasattr(cls, '__add__'):
+        cases['add'] = (lambda: list(map(operator.add, vs, ws)), ())
+    return cases
+
+
+def run_suite(sizes=DEFAULT_SIZES, batch_size=DEFAULT_BATCH_SIZE, classes=None,
+              trials=5, loops=None, min_time=0.01):
+    results = []
+    for label in classes or VECTOR_CLASSES:
+        make, variable_size = VECTOR_CLASSES[label]
+        cls = type(make(_components(2)))
+        groups = [(f'n={size}', single_cases(cls, make, size))
+                  for size in (sizes if variable_size else [2])]
+        if batch_size:
+            groups.append((f'batch={batch_size}', batch_cases(cls, make, batch_size)))
+        for group, cases in groups:
+            for op, (f, args) in cases.items():
+                bench = Benchmark(f, args, name=f'{label}.{op}[{group}]', trials=trials,
+                                  loops=loops, min_time=min_time)
+                results.append(bench.run())
+    return results
+
+
+def format_table(results):
+    """One row per operation and size, one median-runtime column per class"""
+    labels = []
+    rows = {}
+    for result in results:
+        head, bracket, params = result.name.partition('[')
+        label, case = head.rsplit('.', 1)
+        case += bracket + params
+        if label not in labels:
+            labels.append(label)
+        rows.setdefault(case, {})[label] = result.median
+    lines = [f'{"benchmark":<24}' + ''.join(f'{label:>16}' for label in labels)]
+    for case, medians in rows.items():
+        cells = (f'{medians[label]:>16.3e}' if label in medians else f'{"-":>16}'
+                 for label in labels)
+        lines.append(f'{case:<24}' + ''.join(cells))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--classes', nargs='+', choices=list(VECTOR_CLASSES))
+    parser.add_argument('--trials', type=int, default=5)
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare against results saved with --save')
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    options = parser.parse_args(argv)
+
+    results = run_suite(options.sizes, options.batch_size, options.classes, options.trials)
+    print(format_table(results))
+    if options.save:
+        save_results(results, options.save)
+    if options.baseline:
+        regressions = [c for c in compare(results, load_results(options.baseline), options.tolerance)
+                       if c.regressed]
+        for c in regressions:
+            print(f'REGRESSED {c.name}: {c.baseline:.3e} -> {c.current:.3e} ({c.ratio:.2f}x)')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
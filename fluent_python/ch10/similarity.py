@@ -0,0 +1,163 @@
+"""Approximate nearest-neighbor search over Vectors with locality-sensitive hashing.
+
+Every table hashes a vector by projecting it on n_bits random directions.
+For the cosine metric a projection contributes its sign, so vectors at a
+small angle tend to agree on all of them. For the Euclidean metric it
+contributes the index of the slot of width bucket_width it falls in, after
+a random shift. A query reranks, by exact distance, the vectors that share
+a bucket with it in any of the n_tables tables.
+
+More tables or probes raise the recall, more bits make the buckets smaller
+and the queries faster. Probing visits, in each table, the buckets reached
+by moving the query over the boundaries it is closest to.
+"""
+import heapq
+import math
+import random
+from operator import mul
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, it only speeds up the projections
+    np = None
+
+
+METRICS = ('cosine', 'euclidean')
+
+
+def cosine_distance(v, w) -> float:
+    norms = abs(v) * abs(w)
+    if not norms:
+        return 1.0
+    return 1.0 - sum(map(mul, v, w)) / norms
+
+
+def euclidean_distance(v, w) -> float:
+    return math.dist(v, w)
+
+
+_DISTANCES = {'cosine': cosine_distance, 'euclidean': euclidean_distance}
+
+
+def exact_search(vectors, query, k=10, metric='cosine') -> list:
+    """The (index, distance) pairs of the k vectors closest to query, by brute force"""
+    distance = _DISTANCES[metric]
+    return heapq.nsmallest(k, ((i, distance(query, v)) for (i, v) in enumerate(vectors)),
+                           key=lambda pair: pair[1])
+
+
+class LSHIndex:
+    """Approximate nearest-neighbor index over Vectors of a fixed dimension.
+
+    bucket_width is only used by the Euclidean metric, and works best on the
+    order of the distance between a vector and the neighbors it should find.
+    """
+    def __init__(self, dimension: int, metric='cosine', n_tables=8, n_bits=12,
+                 bucket_width=4.0, seed=None):
+        if metric not in METRICS:
+            raise ValueError(f'Unknown metric {metric!r}, expected one of {METRICS}.')
+        self.dimension = dimension
+        self.metric = metric
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.bucket_width = bucket_width
+        self.vectors = []
+        self._distance = _DISTANCES[metric]
+        self._tables = [{} for _ in range(n_tables)]
+        rng = random.Random(seed)
+        self._directions = [[rng.gauss(0.0, 1.0) for _ in range(dimension)]
+                            for _ in range(n_tables * n_bits)]
+        self._offsets = [rng.uniform(0.0, bucket_width) for _ in range(n_tables * n_bits)]
+        self._matrix = np.array(self._directions) if np is not None else None
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def _check(self, vector):
+        if len(vector) != self.dimension:
+            raise ValueError(f'Expected a vector of {self.dimension} components, got {len(vector)}.')
+
+    def _project_many(self, vectors):
+        for v in vectors:
+            self._check(v)
+        if self._matrix is not None:
+            if not vectors:
+                return []
+            stacked = np.array([np.frombuffer(v._components, dtype=v.typecode) for v in vectors],
+                               dtype='d')
+            return (stacked @ self._matrix.T).tolist()
+        return [[sum(map(mul, direction, v._components)) for direction in self._directions]
+                for v in vectors]
+
+    def _hash(self, projections):
+        """Per table, the key of the bucket and the per-bit (margin, position, alternative)"""
+        if self.metric == 'cosine':
+            digits = [p >= 0.0 for p in projections]
+            moves = [(abs(p), i, not d) for (i, (p, d)) in enumerate(zip(projections, digits))]
+        else:
+            width = self.bucket_width
+            digits, moves = [], []
+            for i, (p, offset) in enumerate(zip(projections, self._offsets)):
+                slot = (p + offset) / width
+                digit = math.floor(slot)
+                fraction = slot - digit
+                digits.append(digit)
+                if fraction < 0.5:
+                    moves.append((fraction * width, i, digit - 1))
+                else:
+                    moves.append(((1.0 - fraction) * width, i, digit + 1))
+        n = self.n_bits
+        return [(tuple(digits[t * n:(t + 1) * n]), moves[t * n:(t + 1) * n])
+                for t in range(self.n_tables)]
+
+    def add(self, vector) -> int:
+        """Indexes vector and returns its position in self.vectors"""
+        return self.extend([vector])[0]
+
+    def extend(self, vectors) -> list:
+        vectors = list(vectors)
+        positions = []
+        for v, projections in zip(vectors, self._project_many(vectors)):
+            position = len(self.vectors)
+            self.vectors.append(v)
+            for table, (key, _) in zip(self._tables, self._hash(projections)):
+                try:
+                    table[key].append(position)
+                except KeyError:
+                    table[key] = [position]
+            positions.append(position)
+        return positions
+
+    def _candidates(self, projections, probes):
+        candidates = set()
+        n = self.n_bits
+        for table, (key, moves) in zip(self._tables, self._hash(projections)):
+            candidates.update(table.get(key, ()))
+            for (_, i, alternative) in heapq.nsmallest(probes, moves):
+                probed = list(key)
+                probed[i % n] = alternative
+                candidates.update(table.get(tuple(probed), ()))
+        return candidates
+
+    def query(self, vector, k=10, probes=0) -> list:
+        """The (index, distance) pairs of about the k vectors closest to vector"""
+        return self.query_many([vector], k, probes)[0]
+
+    def query_many(self, vectors, k=10, probes=0) -> list:
+        """query for each of vectors, projecting them all in one batch"""
+        vectors = list(vectors)
+        stored, distance = self.vectors, self._distance
+        results = []
+        for v, projections in zip(vectors, self._project_many(vectors)):
+            candidates = self._candidates(projections, probes)
+            results.append(heapq.nsmallest(k, ((i, distance(v, stored[i])) for i in candidates),
+                                           key=lambda pair: pair[1]))
+        return results
+
+
+def recall(approximate, exact) -> float:
+    """Fraction of the exact neighbors found by an approximate search"""
+    expected = {i for (i, _) in exact}
+    if not expected:
+        return 1.0
+    return len(expected & {i for (i, _) in approximate}) / len(expected)
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from .similarity import LSHIndex, cosine_distance, euclidean_distance, exact_search, recall
+from .vector import Vector, ShortVector
+
+
+def clustered(n, dimension, n_clusters=10, spread=0.1, seed=0):
+    rng = random.Random(seed)
+    centers = [[rng.gauss(0, 1) for _ in range(dimension)] for _ in range(n_clusters)]
+    return [Vector(c + rng.gauss(0, spread) for c in centers[i % n_clusters]) for i in range(n)]
+
+
+class TestLSHIndex:
+    @pytest.fixture
+    def vectors(self):
+        return clustered(500, 32)
+
+    @pytest.fixture
+    def queries(self, vectors):
+        rng = random.Random(1)
+        return [Vector(c + rng.gauss(0, 0.05) for c in v) for v in vectors[::50]]
+
+    def test_distances(self):
+        assert cosine_distance(Vector([1, 0]), Vector([0, 2])) == 1.0
+        assert cosine_distance(Vector([1, 1]), Vector([2, 2])) == pytest.approx(0.0)
+        assert cosine_distance(Vector([0, 0]), Vector([1, 0])) == 1.0
+        assert euclidean_distance(Vector([0, 0]), Vector([3, 4])) == 5.0
+
+    @pytest.mark.parametrize('metric, bucket_width', [('cosine', 4.0), ('euclidean', 4.0)])
+    def test_finds_stored_vectors(self, vectors, metric, bucket_width):
+        index = LSHIndex(32, metric, n_tables=4, n_bits=8, bucket_width=bucket_width, seed=1)
+        assert index.extend(vectors) == list(range(len(vectors)))
+        (i, distance), *_ = index.query(vectors[42], k=3)
+        assert i == 42
+        assert distance == pytest.approx(0.0, abs=1e-12)
+
+    @pytest.mark.parametrize('metric, bucket_width', [('cosine', 4.0), ('euclidean', 4.0)])
+    def test_recall_against_exact_search(self, vectors, queries, metric, bucket_width):
+        index = LSHIndex(32, metric, n_tables=8, n_bits=8, bucket_width=bucket_width, seed=1)
+        index.extend(vectors)
+        found = index.query_many(queries, k=5, probes=2)
+        exact = [exact_search(vectors, q, k=5, metric=metric) for q in queries]
+        assert sum(map(recall, found, exact)) / len(queries) >= 0.9
+        for approximate in found:
+            distances = [d for (_, d) in approximate]
+            assert distances == sorted(distances)
+
+    def test_probes_only_add_candidates(self, vectors, queries):
+        index = LSHIndex(32, n_tables=2, n_bits=16, seed=3)
+        index.extend(vectors)
+        for q in queries:
+            projections = index._project_many([q])[0]
+            assert index._candidates(projections, 0) <= index._candidates(projections, 4)
+
+    def test_pure_python_projections_match_numpy(self, vectors):
+        pytest.importorskip('numpy')
+        index = LSHIndex(32, seed=2)
+        with_numpy = index._project_many(vectors[:5])
+        index._matrix = None
+        for pure_python, projections in zip(index._project_many(vectors[:5]), with_numpy):
+            assert pure_python == pytest.approx(projections)
+
+    def test_single_precision_vectors(self):
+        index = LSHIndex(2, seed=0)
+        index.add(ShortVector([1, 0]))
+        assert index.query(ShortVector([1, 0.01]), k=1)[0][0] == 0
+
+    def test_invalid_input(self):
+        with pytest.raises(ValueError):
+            LSHIndex(2, metric='manhattan')
+        with pytest.raises(ValueError):
+            LSHIndex(2).add(Vector([1, 2, 3]))
+        assert LSHIndex(2).query(Vector([1, 2])) == []
+        assert recall([], []) == 1.0
@@ -1,7 +1,12 @@
+import copy
 import math
+import pickle
+import sys
+from array import array
+
 import pytest
 
-from .vector import Vector, ShortVector
+from .vector import Vector, ShortVector, FrozenVector
 
 
 class TestVector:
@@ -53,6 +58,29 @@ class TestVector:
         vl3 = Vector.frombytes(octets)
         assert vl3 == vec_len_3
 
+    def test_bytes(self, vec_len_3):
+        assert bytes(vec_len_3) == b'd' + array('d', [1, 2, 3]).tobytes()
+        assert Vector.frombytes(bytes(ShortVector([0.5, 2]))) == Vector([0.5, 2])
+        with pytest.raises(ValueError):
+            Vector.frombytes(b'd123')
+
+    def test_frombuffer_shares_memory(self):
+        components = array('d', [1, 2, 3])
+        v = Vector.frombuffer(components)
+        assert v == Vector([1, 2, 3])
+        components[0] = 10
+        assert v.x == 10
+        v.y = 20
+        assert components[1] == 20
+        assert Vector.frombuffer(components.tobytes()) == v
+        assert bytes(v) == bytes(Vector([10, 20, 3]))
+
+    @pytest.mark.skipif(sys.version_info < (3, 12), reason='PEP 688 buffer protocol')
+    def test_buffer_protocol(self, vec_len_3):
+        memv = memoryview(vec_len_3)
+        assert memv.format == 'd'
+        assert memv.tolist() == [1, 2, 3]
+
     def test_len(self, vec_1, vec_len_3, null_vec):
         assert len(vec_1) == 2
         assert len(vec_len_3) == 3
@@ -90,6 +118,36 @@ class TestVector:
         v.x = 10
         assert v.x == 10
         assert v[0] == 10
+        w = Vector(range(2))
+        with pytest.raises(AttributeError):
+            w.z = 1
+
+    def test_shortcut_names_of_subclass(self):
+        class Vector3d(Vector):
+            shortcut_names = 'uvw'
+        v = Vector3d([1, 2, 3])
+        assert (v.u, v.v, v.w) == (1, 2, 3)
+        v.w = 10
+        assert v[2] == 10
+        assert Vector([1]).x == 1
+
+    def test_subclass_hides_unused_shortcut_names(self):
+        class Vector2d(Vector):
+            shortcut_names = 'ab'
+        v = Vector2d([1, 2, 3])
+        assert (v.a, v.b) == (1, 2)
+        for name in 'xyzt':
+            assert not hasattr(v, name)
+            with pytest.raises(AttributeError):
+                setattr(v, name, 0)
+        assert v == Vector([1, 2, 3])
+
+        class Vector4d(Vector2d):
+            shortcut_names = 'xyab'
+        w = Vector4d([1, 2, 3, 4])
+        assert (w.x, w.y, w.a, w.b) == (1, 2, 3, 4)
+        assert not hasattr(w, 'z')
+        assert Vector([1, 2, 3]).z == 3
 
     def test_get_class_attributes(self):
         v = Vector(range(10))
@@ -97,9 +155,80 @@ class TestVector:
         assert v.shortcut_names == 'xyzt'
 
     def test_hash(self):
-        assert hash(Vector([])) == 0
-        assert hash(Vector([1])) == 1
-        assert hash(Vector([0, 1])) == 1
+        assert hash(Vector([])) == hash(())
+        assert hash(Vector([1, 2])) == hash((1.0, 2.0))
+        assert hash(Vector([1, 2])) != hash(Vector([2, 1]))
+        assert hash(Vector([1, 1])) != hash(Vector([2, 2]))
+        assert hash(Vector([1, 2])) == hash(ShortVector([1, 2]))
+
+    def test_hash_of_long_vectors(self):
+        v = Vector(range(3000))
+        assert hash(v) == hash(Vector(range(3000)))
+        assert hash(v) != hash(Vector(reversed(range(3000))))
+
+    def test_eq_compares_lengths(self):
+        assert Vector([1, 2]) != Vector([1, 2, 0])
+        assert Vector([1, 2, 0]) != Vector([1, 2])
+
+    def test_shortcut_writes_reset_cached_hash_and_norm(self):
+        v = Vector([3, 4])
+        assert abs(v) == 5.0
+        h = hash(v)
+        v.x = 0
+        assert abs(v) == 4.0
+        assert hash(v) != h
+        assert hash(v) == hash(Vector([0, 4]))
+        v.y = 0
+        assert bool(v) is False
+
+    def test_copy_shares_components_until_written(self):
+        v = Vector([3, 4])
+        w = copy.copy(v)
+        assert w == v and w is not v
+        assert w._components is v._components
+        w.x = 0
+        assert w._components is not v._components
+        assert v == Vector([3, 4])
+        assert w == Vector([0, 4])
+        v.y = 1
+        assert v == Vector([3, 1])
+        assert w == Vector([0, 4])
+
+    def test_copy_of_frombuffer_vector_owns_its_array(self):
+        buffer = array('d', [1, 2])
+        w = copy.copy(Vector.frombuffer(buffer))
+        buffer[0] = 5
+        assert w == Vector([1, 2])
+
+    def test_deepcopy(self):
+        v = ShortVector([1, 2, 3])
+        w = copy.deepcopy([v, v])
+        assert w[0] is w[1]
+        assert type(w[0]) is ShortVector
+        assert w[0] == v
+        assert w[0]._components is not v._components
+
+    def test_pickle(self):
+        for v in (Vector([1, 2, 3]), ShortVector([1, 2]), FrozenVector([3, 4])):
+            w = pickle.loads(pickle.dumps(v))
+            assert type(w) is type(v)
+            assert w == v
+
+
+class TestFrozenVector:
+    def test_cannot_assign_shortcuts(self):
+        v = FrozenVector([3, 4])
+        with pytest.raises(AttributeError):
+            v.x = 0
+        assert v == Vector([3, 4])
+
+    def test_caches_hash_and_norm(self):
+        v = FrozenVector([3, 4])
+        assert abs(v) == abs(v) == 5.0
+        assert hash(v) == hash(Vector([3, 4]))
+        assert {v: 1}[FrozenVector([3, 4])] == 1
+        assert bool(v) is True
+        assert bool(FrozenVector([0, 0])) is False
 
 
 class TestShortVector:
@@ -1,17 +1,83 @@
 import math
 from array import array
-from functools import reduce
-from operator import xor 
 from typing import Iterable, Union
 import numbers
 
+HASH_BLOCK = 1024  # components are hashed as tuples of at most this many
+
+
+class ShortcutComponent:
+    """Reads and writes the component of a Vector at a fixed index"""
+    def __init__(self, index: int):
+        self.index = index
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def _missing(self, instance):
+        return AttributeError(
+            f'{type(instance).__name__!r} object has no attribute {self.name!r}')
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance._components[self.index]
+        except IndexError:
+            raise self._missing(instance) from None
+
+    def __set__(self, instance, value) -> None:
+        if instance.frozen:
+            raise AttributeError(
+                f'cannot assign to {self.name!r} of frozen {type(instance).__name__!r}')
+        if instance._shared:
+            instance._detach()
+        try:
+            instance._components[self.index] = value
+        except IndexError:
+            raise self._missing(instance) from None
+        instance._hash = instance._norm = None
+
+
+class HiddenShortcut:
+    """Hides a shortcut name inherited by a subclass that does not use it"""
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def _missing(self, owner):
+        return AttributeError(f'{owner.__name__!r} object has no attribute {self.name!r}')
+
+    def __get__(self, instance, owner=None):
+        raise self._missing(owner or type(instance))
+
+    def __set__(self, instance, value) -> None:
+        raise self._missing(type(instance))
+
+
+def _install_shortcuts(cls):
+    for index, name in enumerate(cls.shortcut_names):
+        descriptor = ShortcutComponent(index)
+        descriptor.__set_name__(cls, name)
+        setattr(cls, name, descriptor)
+    inherited = {name for base in cls.__mro__[1:] for (name, attr) in vars(base).items()
+                 if isinstance(attr, ShortcutComponent)}
+    for name in inherited.difference(cls.shortcut_names, vars(cls)):
+        hidden = HiddenShortcut()
+        hidden.__set_name__(cls, name)
+        setattr(cls, name, hidden)
+
 
 class Vector:
+    __slots__ = ('_components', '_hash', '_norm', '_shared', '__weakref__')
     typecode = 'd'  # needed to convert to/from bytes
     shortcut_names = 'xyzt'
+    frozen = False
 
     def __init__(self, components: Iterable):
         self._components = array(self.typecode, components)
+        self._hash = self._norm = None  # caches, reset by shortcut writes
+        self._shared = False  # whether a copy may be using the same array
 
     def __repr__(self):
         return f'{self.__class__.__name__}(' + ', '.join((str(c) for c in self._components)) + ')'
@@ -23,21 +89,45 @@ class Vector:
         return iter(self._components)
     
     def __bytes__(self):
-        return (bytes([ord(self.typecode)]) +
-            bytes(array(self.typecode, self)))
+        return b''.join((bytes([ord(self.typecode)]), self._components))
+
+    def __buffer__(self, flags):
+        # buffer protocol from Python 3.12 on (PEP 688)
+        return memoryview(self._components)
 
     def __eq__(self, other: 'Vector2d'):
-        return all(c1 == c2 for (c1, c2) in zip(self._components, other._components)) 
+        if len(self) != len(other):
+            return False
+        return all(c1 == c2 for (c1, c2) in zip(self._components, other._components))
  
     def __hash__(self):
-        hashes = map(hash, self._components)
-        return reduce(xor, hashes, 0)
+        if self._hash is None:
+            components = self._components
+            if len(components) <= HASH_BLOCK:
+                self._hash = hash(tuple(components))
+            else:
+                # hash of the block hashes, so that blocks can be hashed in parallel
+                blocks = (hash(tuple(components[i:i + HASH_BLOCK]))
+                          for i in range(0, len(components), HASH_BLOCK))
+                self._hash = hash(tuple(blocks))
+        return self._hash
 
     def __abs__(self):
-        return math.sqrt(sum(e**2 for e in self))
+        if self._norm is None:
+            self._norm = math.sqrt(sum(e**2 for e in self))
+        return self._norm
 
     def __bool__(self):
-        return abs(self) > 0
+        if self._norm is not None:
+            return self._norm > 0
+        return any(self._components)
+
+    def __sizeof__(self):
+        # sys.getsizeof counts the components too, so that caches can budget by size
+        components = self._components
+        if isinstance(components, array):
+            return object.__sizeof__(self) + components.__sizeof__()
+        return object.__sizeof__(self) + components.nbytes  # a view keeps its buffer alive
 
     def __len__(self):
         return len(self._components)
@@ -50,33 +140,82 @@ class Vector:
         else:
             raise TypeError(f'Invalid input to __getitem__ {index} of type {type(index)}.')
 
-    @property
-    def _lookup_index(self):
-        return dict(
-            zip(self.shortcut_names, range(len(self._components))))
-
-    def __getattr__(self, attr: str) -> float:
-        cls = type(self)
-        if attr in set(cls.shortcut_names):
-            try:
-                return self._components[self._lookup_index[attr]]
-            except KeyError:
-                raise AttributeError
-        return super().__getattr__(attr)
-
-    def __setattr__(self, attr: str, value) -> None:
-        cls = type(self)
-        if attr in set(cls.shortcut_names):
-            self._components[self._lookup_index[attr]] = value
-        else:
-            super().__setattr__(attr, value)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'shortcut_names' in cls.__dict__:
+            _install_shortcuts(cls)
+
+    @classmethod
+    def _fromcomponents(cls, components):
+        # wraps an array or memoryview of cls.typecode items without copying it
+        vector = cls.__new__(cls)
+        vector._components = components
+        vector._hash = vector._norm = None
+        vector._shared = False
+        return vector
+
+    def _copy_components(self):
+        components = self._components
+        if isinstance(components, array):
+            return components[:]
+        clone = array(self.typecode)
+        clone.frombytes(components.cast('B'))
+        return clone
+
+    def _detach(self):
+        # called before a write to an array that a copy may share
+        self._components = self._copy_components()
+        self._shared = False
+
+    def __copy__(self):
+        """Copy sharing the components array until either side writes to it"""
+        if not isinstance(self._components, array):
+            # a frombuffer view stays tied to its buffer, the copy gets its own array
+            return self.__deepcopy__({})
+        clone = self._fromcomponents(self._components)
+        clone._hash, clone._norm = self._hash, self._norm
+        self._shared = clone._shared = True
+        return clone
+
+    def __deepcopy__(self, memo):
+        clone = memo[id(self)] = self._fromcomponents(self._copy_components())
+        clone._hash, clone._norm = self._hash, self._norm
+        return clone
+
+    def __reduce__(self):
+        return type(self).frombytes, (bytes(self),)
 
     @classmethod
     def frombytes(cls, octets):
         typecode = chr(octets[0])
-        memv = memoryview(octets[1:]).cast(typecode)
-        return cls(memv)
+        if typecode != cls.typecode:
+            return cls(memoryview(octets)[1:].cast(typecode))
+        components = array(typecode)
+        components.frombytes(memoryview(octets)[1:])
+        return cls._fromcomponents(components)
+
+    @classmethod
+    def frombuffer(cls, buffer):
+        """Vector sharing memory with a buffer of raw cls.typecode items.
+
+        Writes made through the buffer itself do not reset the cached hash
+        and norm of the vector.
+        """
+        memv = memoryview(buffer)
+        if memv.format != cls.typecode:
+            memv = memv.cast('B').cast(cls.typecode)
+        return cls._fromcomponents(memv)
+
+
+_install_shortcuts(Vector)
 
 
 class ShortVector(Vector):
-    typecode = 'f'
\ No newline at end of file
+    __slots__ = ()
+    typecode = 'f'
+
+
+class FrozenVector(Vector):
+    """Vector whose shortcut components cannot be reassigned"""
+    __slots__ = ()
+    frozen = True
@@ -0,0 +1,220 @@
+import copy
+import numbers
+from array import array
+from collections.abc import Iterable, Sized
+from itertools import repeat, zip_longest
+from operator import add, mul, neg, sub
+
+from .vector import Vector
+
+MAX_DEPTH = 64  # nested operations an expression keeps before evaluating its operands
+
+
+def _add_keeping_tails(x, y):
+    # the tail of the longer operand is copied as is, like Vector._add_my_version
+    if x is None:
+        return y
+    if y is None:
+        return x
+    return x + y
+
+
+def _apply(sign, x, y):
+    # one step of a sum, with None past the end of the shorter operand
+    if sign == 'add':
+        return _add_keeping_tails(x, y)
+    return (0.0 if x is None else x) - (0.0 if y is None else y)
+
+
+def _is_operand(other):
+    return isinstance(other, Iterable) and isinstance(other, Sized)
+
+
+def _snapshot(operand):
+    # Vectors can change in place, so the expression keeps a copy, which
+    # shares the components array until either side writes to it
+    if isinstance(operand, Vector) and not isinstance(operand, LazyVector):
+        return copy.copy(operand)
+    return operand
+
+
+class LazyVector(Vector):
+    """Vector expression evaluated in a single fused pass over its operands.
+
+    Arithmetic on a LazyVector only records the operation. Iterating over
+    the result streams the elements without building intermediate vectors,
+    indexing computes a single element, and anything that needs the whole
+    array (bytes, equality, hashing, slicing, shortcut names) evaluates it
+    once and keeps the result.
+
+    Chains of additions and subtractions are kept as a single 'sum' node,
+    and operands nested more than MAX_DEPTH operations deep are evaluated,
+    so long expressions do not recurse. Vector operands are copied when
+    the expression is built, so later changes to them do not affect it;
+    other sequences are held by reference.
+    """
+    __slots__ = ('_op', '_operands', '_signs', '_length', '_value', '_depth')
+
+    def __init__(self, op: str, *operands, signs=()):
+        if op == 'add' or op == 'sub':
+            op, signs = 'sum', (op,)
+        self._init(op, [_snapshot(operand) for operand in operands], signs)
+
+    def _init(self, op, operands, signs):
+        # takes ownership of the operands, which are already snapshots
+        depths = [operand._depth for operand in operands if isinstance(operand, LazyVector)]
+        depth = 1 + max(depths, default=0)
+        if depth > MAX_DEPTH:
+            operands = [operand.evaluate() if isinstance(operand, LazyVector) else operand
+                        for operand in operands]
+            depth = 1
+        self._op = op
+        self._operands = tuple(operands)
+        self._signs = tuple(signs)
+        self._depth = depth
+        self._value = None
+        self._hash = self._norm = None
+        self._shared = False
+        if op == 'leaf' or op == 'neg' or op == 'mul':
+            self._length = len(operands[0])
+        else:
+            self._length = max(map(len, operands))
+
+    @property
+    def _components(self):
+        if self._value is None:
+            self._value = array(self.typecode, self._iter_fused())
+        return self._value
+
+    @classmethod
+    def _fromcomponents(cls, components):
+        return lazy(Vector._fromcomponents(components))
+
+    def __copy__(self):
+        # the operands are never modified through an expression, so the copy
+        # can reuse them and evaluate its own array
+        return LazyVector(self._op, *self._operands, signs=self._signs)
+
+    def evaluate(self) -> Vector:
+        return Vector(self._components)
+
+    def _iter_fused(self):
+        op, operands = self._op, self._operands
+        if op == 'leaf':
+            return iter(operands[0])
+        elif op == 'neg':
+            return map(neg, operands[0])
+        elif op == 'mul':
+            return map(mul, operands[0], repeat(operands[1]))
+        return self._iter_sum()
+
+    def _iter_sum(self):
+        operands, signs = self._operands, self._signs
+        if all(len(operand) == self._length for operand in operands):
+            functions = [add if sign == 'add' else sub for sign in signs]
+            for first, *rest in zip(*operands):
+                for f, y in zip(functions, rest):
+                    first = f(first, y)
+                yield first
+        else:
+            for first, *rest in zip_longest(*operands):
+                for sign, y in zip(signs, rest):
+                    first = _apply(sign, first, y)
+                yield first
+
+    def _item(self, index: int):
+        op, operands = self._op, self._operands
+        if op == 'leaf':
+            return operands[0][index]
+        elif op == 'neg':
+            return -operands[0][index]
+        elif op == 'mul':
+            return operands[0][index] * operands[1]
+        first, *rest = (operand[index] if index < len(operand) else None for operand in operands)
+        for sign, y in zip(self._signs, rest):
+            first = _apply(sign, first, y)
+        return first
+
+    def __iter__(self):
+        if self._value is not None:
+            return iter(self._value)
+        return self._iter_fused()
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if self._value is None and isinstance(index, numbers.Integral):
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError('LazyVector index out of range')
+            return self._item(index)
+        return super().__getitem__(index)
+
+    # reductions stream an unevaluated expression instead of building its array
+    def _uses_numpy(self, *others):
+        return self._value is not None and super()._uses_numpy(*others)
+
+    def __rmatmul__(self, other):
+        # defined here so that vector @ expression is tried on the expression first
+        return self @ other
+
+    # expressions are rebuilt by the infix operators, never updated in place
+    def _writable_components(self, length):
+        return None
+
+    def __repr__(self):
+        signs = f', signs={self._signs!r}' if self._op == 'sum' else ''
+        return (f'{self.__class__.__name__}({self._op!r}, '
+                + ', '.join(map(repr, self._operands)) + signs + ')')
+
+    # unary operators
+    def __pos__(self):
+        return LazyVector('leaf', self)
+
+    def __neg__(self):
+        return LazyVector('neg', self)
+
+    # infix operators
+    def _extend_sum(self, sign, other):
+        # self [+-] other as one more term of self, instead of a nested node
+        if self._op != 'sum':
+            return LazyVector(sign, self, other)
+        node = LazyVector.__new__(LazyVector)
+        node._init('sum', [*self._operands, _snapshot(other)], self._signs + (sign,))
+        return node
+
+    def __add__(self, other):
+        if not _is_operand(other):
+            return NotImplemented
+        return self._extend_sum('add', other)
+
+    def __radd__(self, other):
+        if not _is_operand(other):
+            return NotImplemented
+        # elementwise addition commutes, tails included
+        return self._extend_sum('add', other)
+
+    def __sub__(self, other):
+        if not _is_operand(other):
+            return NotImplemented
+        return self._extend_sum('sub', other)
+
+    def __rsub__(self, other):
+        if not _is_operand(other):
+            return NotImplemented
+        return LazyVector('sub', other, self)
+
+    def __mul__(self, scalar):
+        if not isinstance(scalar, numbers.Real):
+            return NotImplemented
+        return LazyVector('mul', self, scalar)
+
+    def __rmul__(self, scalar):
+        return self.__mul__(scalar)
+
+
+def lazy(vector) -> LazyVector:
+    """Starts a lazy expression from a Vector or any sized iterable of numbers"""
+    return LazyVector('leaf', vector)
@@ -0,0 +1,331 @@
+import math
+import numbers
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from itertools import compress, count, repeat
+from operator import neg, sub
+
+from .vector import HASH_BLOCK, ShortcutComponent, Vector
+
+
+class SparseShortcut(ShortcutComponent):
+    """Reads and writes a component of a SparseVector without densifying it"""
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if self.index >= instance._length:
+            raise self._missing(instance)
+        return instance._item(self.index)
+
+    def __set__(self, instance, value) -> None:
+        if instance.frozen:
+            raise AttributeError(
+                f'cannot assign to {self.name!r} of frozen {type(instance).__name__!r}')
+        if self.index >= instance._length:
+            raise self._missing(instance)
+        instance._set_item(self.index, value)
+        instance._hash = instance._norm = None
+
+
+def _dense(length, indices, values, typecode='d'):
+    components = array(typecode)
+    components.frombytes(bytes(length * components.itemsize))
+    for i, v in zip(indices, values):
+        components[i] = v
+    return components
+
+
+def _pack(length, indices, values):
+    # the cheaper representation for an arithmetic result
+    if len(indices) > SparseVector.max_density * length:
+        return Vector._fromcomponents(_dense(length, indices, values))
+    return SparseVector._fromitems(length, indices, values)
+
+
+def _scatter_add(dense, negate, length, indices, values, sign):
+    """(-)dense + sign * sparse as a Vector of the given length"""
+    components = dense._components
+    if negate:
+        # 0.0 - x, like Vector subtraction, where -x would give -0.0 for zeros
+        result = array('d', map(sub, repeat(0.0), components))
+    elif isinstance(components, array) and components.typecode == 'd':
+        result = components[:]
+    else:
+        result = array('d', components)
+    if len(result) < length:
+        result.frombytes(bytes(8 * (length - len(result))))
+    if sign > 0:
+        for i, v in zip(indices, values):
+            result[i] += v
+    else:
+        for i, v in zip(indices, values):
+            result[i] -= v
+    return Vector._fromcomponents(result)
+
+
+def _as_vector(other):
+    if isinstance(other, Vector):
+        return other
+    return Vector(other)
+
+
+class SparseVector(Vector):
+    """Vector that only stores its nonzero components, by index.
+
+    SparseVector(iterable) keeps the nonzero items of a dense iterable, and
+    SparseVector({index: value}, length=n) builds one from its nonzero
+    components. It compares, hashes and converts to bytes like the Vector
+    with the same components, so the bytes format stays dense; -0.0 is
+    stored as a plain zero.
+
+    Arithmetic between sparse vectors stays sparse while at most
+    max_density of the result is nonzero, and arithmetic with dense
+    vectors, or with a scalar that turns the zeros into nan, returns a
+    dense Vector.
+    """
+    __slots__ = ('_indices', '_values', '_length')
+    shortcut_class = SparseShortcut
+    max_density = 0.25
+
+    def __init__(self, components=(), length=None):
+        if isinstance(components, Mapping):
+            items = sorted((i, v) for (i, v) in components.items() if v)
+            if length is None:
+                length = items[-1][0] + 1 if items else 0
+            if items and not 0 <= items[0][0] <= items[-1][0] < length:
+                raise IndexError(f'SparseVector indices must be in range({length}).')
+            self._indices = array('q', (i for (i, _) in items))
+            self._values = array(self.typecode, (v for (_, v) in items))
+        else:
+            dense = array(self.typecode, components)
+            self._indices = array('q', compress(count(), dense))
+            self._values = array(self.typecode, filter(None, dense))
+            length = len(dense)
+        self._length = length
+        self._hash = self._norm = None
+        self._shared = False
+
+    @classmethod
+    def _fromitems(cls, length, indices, values):
+        # takes ownership of sorted arrays of indices and nonzero values
+        vector = cls.__new__(cls)
+        vector._length = length
+        vector._indices = indices
+        vector._values = values
+        vector._hash = vector._norm = None
+        vector._shared = False
+        return vector
+
+    @classmethod
+    def _fromcomponents(cls, components):
+        return cls(components)
+
+    @property
+    def _components(self):
+        return _dense(self._length, self._indices, self._values, self.typecode)
+
+    def items(self):
+        """(index, value) pairs of the nonzero components"""
+        return zip(self._indices, self._values)
+
+    def _item(self, index):
+        position = bisect_left(self._indices, index)
+        if position < len(self._indices) and self._indices[position] == index:
+            return self._values[position]
+        return 0.0
+
+    def _set_item(self, index, value):
+        position = bisect_left(self._indices, index)
+        present = position < len(self._indices) and self._indices[position] == index
+        if value:
+            if present:
+                self._values[position] = value
+            else:
+                self._indices.insert(position, index)
+                self._values.insert(position, value)
+        elif present:
+            del self._indices[position]
+            del self._values[position]
+
+    # the infix operators pick the cheaper representation of the result
+    def _writable_components(self, length):
+        return None
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({dict(self.items())!r}, length={self._length})'
+
+    def __iter__(self):
+        position = 0
+        for i, v in zip(self._indices, self._values):
+            yield from repeat(0.0, i - position)
+            yield v
+            position = i + 1
+        yield from repeat(0.0, self._length - position)
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + self._indices.__sizeof__() + self._values.__sizeof__()
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, numbers.Integral):
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError('SparseVector index out of range')
+            return self._item(index)
+        elif isinstance(index, slice):
+            selected = range(*index.indices(self._length))
+            items = sorted((selected.index(i), v) for (i, v) in self.items() if i in selected)
+            return SparseVector._fromitems(len(selected), array('q', (i for (i, _) in items)),
+                                           array(self.typecode, (v for (_, v) in items)))
+        else:
+            raise TypeError(f'Invalid input to __getitem__ {index} of type {type(index)}.')
+
+    def __eq__(self, other):
+        if not isinstance(other, Vector):
+            return NotImplemented
+        if self._length != len(other):
+            return False
+        if isinstance(other, SparseVector):
+            return self._indices == other._indices and self._values == other._values
+        dense = other._components
+        if not isinstance(dense, array):
+            dense = array(other.typecode, dense)
+        nonzero = len(dense) - dense.count(0.0)
+        return nonzero == len(self._indices) and all(dense[i] == v for (i, v) in self.items())
+
+    def __hash__(self):
+        # same value as Vector.__hash__, computing only the blocks with nonzeros
+        if self._hash is None:
+            n = self._length
+            if n <= HASH_BLOCK:
+                self._hash = hash(tuple(self))
+            else:
+                n_blocks = -(-n // HASH_BLOCK)
+                hashes = [_ZERO_BLOCK_HASH] * n_blocks
+                hashes[-1] = hash((0.0,) * (n - (n_blocks - 1) * HASH_BLOCK))
+                indices, values = self._indices, self._values
+                for block in {i // HASH_BLOCK for i in indices}:
+                    start = block * HASH_BLOCK
+                    stop = min(start + HASH_BLOCK, n)
+                    lo, hi = bisect_left(indices, start), bisect_left(indices, stop)
+                    dense = _dense(stop - start, (i - start for i in indices[lo:hi]), values[lo:hi])
+                    hashes[block] = hash(tuple(dense))
+                self._hash = hash(tuple(hashes))
+        return self._hash
+
+    def __abs__(self):
+        if self._norm is None:
+            self._norm = math.sqrt(sum(v * v for v in self._values))
+        return self._norm
+
+    def __bool__(self):
+        return len(self._values) > 0
+
+    def __copy__(self):
+        clone = self._fromitems(self._length, self._indices[:], self._values[:])
+        clone._hash, clone._norm = self._hash, self._norm
+        return clone
+
+    def __deepcopy__(self, memo):
+        clone = memo[id(self)] = self.__copy__()
+        return clone
+
+    def __reduce__(self):
+        return type(self), (dict(self.items()), self._length)
+
+    # unary operators
+    def __pos__(self):
+        return SparseVector._fromitems(self._length, self._indices[:], array('d', self._values))
+
+    def __neg__(self):
+        return SparseVector._fromitems(self._length, self._indices[:], array('d', map(neg, self._values)))
+
+    # infix operators
+    def _combine(self, other, sign):
+        """self + sign * other, for a sparse other"""
+        merged = dict(self.items())
+        get = merged.get
+        for i, v in other.items():
+            merged[i] = get(i, 0.0) + sign * v
+        indices = sorted(i for (i, v) in merged.items() if v)
+        return _pack(max(self._length, other._length), array('q', indices),
+                     array('d', (merged[i] for i in indices)))
+
+    def __add__(self, other):
+        try:
+            other = _as_vector(other)
+        except TypeError:
+            return NotImplemented
+        if isinstance(other, SparseVector):
+            return self._combine(other, 1)
+        return _scatter_add(other, False, max(self._length, len(other)),
+                            self._indices, self._values, 1)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        try:
+            other = _as_vector(other)
+        except TypeError:
+            return NotImplemented
+        if isinstance(other, SparseVector):
+            return self._combine(other, -1)
+        return _scatter_add(other, True, max(self._length, len(other)),
+                            self._indices, self._values, 1)
+
+    def __rsub__(self, other):
+        try:
+            other = _as_vector(other)
+        except TypeError:
+            return NotImplemented
+        return _scatter_add(other, False, max(self._length, len(other)),
+                            self._indices, self._values, -1)
+
+    def __mul__(self, scalar):
+        if not isinstance(scalar, numbers.Real):
+            return NotImplemented
+        if not math.isfinite(scalar):
+            # the zeros become nan too, so the result is dense
+            return Vector._fromcomponents(array('d', [x * scalar for x in self]))
+        products = [(i, v * scalar) for (i, v) in self.items()]
+        return SparseVector._fromitems(self._length, array('q', (i for (i, p) in products if p)),
+                                       array('d', (p for (_, p) in products if p)))
+
+    def __rmul__(self, scalar):
+        return self * scalar
+
+    def __truediv__(self, scalar):
+        if not isinstance(scalar, numbers.Real):
+            return NotImplemented
+        if not scalar:
+            raise ZeroDivisionError('division by zero')
+        if math.isnan(scalar):
+            return Vector._fromcomponents(array('d', [x / scalar for x in self]))
+        quotients = [(i, v / scalar) for (i, v) in self.items()]
+        return SparseVector._fromitems(self._length, array('q', (i for (i, q) in quotients if q)),
+                                       array('d', (q for (_, q) in quotients if q)))
+
+    def __matmul__(self, other):
+        """Dot product, over the components the two vectors have in common"""
+        if isinstance(other, SparseVector):
+            if len(other._values) < len(self._values):
+                self, other = other, self
+            return sum(v * other._item(i) for (i, v) in self.items())
+        try:
+            other = _as_vector(other)
+        except TypeError:
+            return NotImplemented
+        dense = other._components
+        n = len(dense)
+        return sum(v * dense[i] for (i, v) in self.items() if i < n)
+
+    def __rmatmul__(self, other):
+        return self @ other
+
+
+_ZERO_BLOCK_HASH = hash((0.0,) * HASH_BLOCK)
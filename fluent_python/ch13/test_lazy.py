@@ -0,0 +1,120 @@
+import copy
+
+import pytest
+
+from .lazy import LazyVector, lazy
+from .vector import Vector
+
+
+class TestLazyVector:
+    @pytest.fixture
+    def a(self):
+        return Vector([1, 2, 3])
+
+    @pytest.fixture
+    def b(self):
+        return Vector([-1, -2, -3, -4])
+
+    @pytest.fixture
+    def c(self):
+        return Vector([0.5, 0.5])
+
+    def test_builds_expression_without_evaluating(self, a, b, c):
+        expr = lazy(a) + b * 3 - c
+        assert isinstance(expr, LazyVector)
+        assert expr._value is None
+        assert len(expr) == 4
+        assert expr._value is None
+
+    def test_matches_eager_evaluation(self, a, b, c):
+        expressions = [
+            (lambda x: x + b * 3 - c), (lambda x: -x + c), (lambda x: 2 * x - b),
+            (lambda x: b + x), (lambda x: c - x), (lambda x: x + (1, 2)),
+            (lambda x: (1, 2, 3, 4, 5) - x), (lambda x: +x * 0.5),
+        ]
+        for f in expressions:
+            assert bytes(f(lazy(a))) == bytes(f(a))
+            assert list(f(lazy(a))) == list(f(a))
+
+    def test_vector_on_the_left_stays_lazy(self, a, b):
+        assert isinstance(b + lazy(a), LazyVector)
+        assert isinstance(b - lazy(a), LazyVector)
+        assert b + lazy(a) == b + a
+
+    def test_indexing_computes_one_element(self, a, b, c):
+        expr = lazy(a) + b * 3 - c
+        eager = a + b * 3 - c
+        assert [expr[i] for i in range(4)] == list(eager)
+        assert expr[-1] == eager[-1]
+        assert expr._value is None
+        with pytest.raises(IndexError):
+            expr[4]
+
+    def test_evaluates_once(self, a, b):
+        expr = lazy(a) + b
+        assert expr[1:3] == Vector([0, 0])
+        value = expr._value
+        assert value is not None
+        assert expr.x == 0
+        assert expr._value is value
+        assert expr.evaluate() == Vector([0, 0, 0, -4])
+        assert type(expr.evaluate()) is Vector
+
+    def test_reductions_stream(self, a, b):
+        expr = lazy(a) - b
+        assert abs(expr) == abs(a - b)
+        assert expr @ a == (a - b) @ a
+        assert expr._value is None
+
+    def test_long_reductions_stream(self):
+        pytest.importorskip('numpy')
+        n = Vector.numpy_threshold
+        a, b = Vector(range(n)), Vector([1] * n)
+        expr = lazy(a) - b
+        assert abs(expr) == pytest.approx(abs(a - b))
+        assert expr @ a == pytest.approx((a - b) @ a)
+        assert a @ expr == pytest.approx((a - b) @ a)
+        assert expr._value is None
+
+    def test_unsupported_operands(self, a):
+        with pytest.raises(TypeError):
+            lazy(a) + 1
+        with pytest.raises(TypeError):
+            lazy(a) * a
+
+    def test_copy(self, a, b):
+        expr = lazy(a) + b
+        clone = copy.copy(expr)
+        assert isinstance(clone, LazyVector)
+        assert clone._value is None
+        assert clone == expr
+        deep = copy.deepcopy(expr)
+        assert isinstance(deep, LazyVector)
+        assert deep == a + b
+
+    def test_in_place_operators_stay_lazy(self, a, b):
+        expr = lazy(a)
+        expr += b
+        assert isinstance(expr, LazyVector)
+        assert expr == a + b
+        assert a == Vector(a)
+
+    def test_long_accumulations_do_not_recurse(self, a, b):
+        expr = lazy(a)
+        eager = a
+        for i in range(2000):
+            w = b if i % 2 else Vector([i, 0.5])
+            expr = expr + w if i % 3 else expr - w
+            eager = eager + w if i % 3 else eager - w
+        assert expr[3] == eager[3]
+        assert bytes(expr) == bytes(eager)
+        scaled = lazy(a)
+        for _ in range(1000):
+            scaled = -(scaled * 1.0 + b)
+        assert list(scaled) == list(scaled.evaluate())
+
+    def test_operands_are_snapshots(self, a, b):
+        expr = lazy(a) + b
+        a.x = 100
+        b += Vector([1, 1, 1, 1])
+        assert expr == Vector([0, 0, 0, -4])
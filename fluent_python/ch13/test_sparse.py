@@ -0,0 +1,159 @@
+import copy
+import pickle
+
+import pytest
+
+from .sparse import SparseVector
+from .vector import HASH_BLOCK, Vector, FrozenVector
+
+
+class TestSparseVector:
+    @pytest.fixture
+    def dense(self):
+        return Vector([0, 3, 0, 0, 4, 0])
+
+    @pytest.fixture
+    def sparse(self, dense):
+        return SparseVector(dense)
+
+    def test_stores_only_nonzeros(self, sparse):
+        assert list(sparse.items()) == [(1, 3.0), (4, 4.0)]
+        assert len(sparse) == 6
+        assert sparse == SparseVector({1: 3, 4: 4, 5: 0}, length=6)
+        assert len(SparseVector({7: 1})) == 8
+        with pytest.raises(IndexError):
+            SparseVector({7: 1}, length=5)
+
+    def test_behaves_like_the_dense_vector(self, sparse, dense):
+        assert list(sparse) == list(dense)
+        assert sparse == dense and dense == sparse
+        assert sparse == Vector.frombuffer(bytes(dense)[1:])
+        assert hash(sparse) == hash(dense)
+        assert bytes(sparse) == bytes(dense)
+        assert abs(sparse) == abs(dense) == 5.0
+        assert bool(sparse) and not SparseVector([0, 0])
+        assert sparse[1] == sparse[-5] == 3.0
+        assert sparse[0] == 0.0
+        with pytest.raises(IndexError):
+            sparse[6]
+        assert str(sparse) == str(dense)
+
+    def test_eq_and_hash_with_long_vectors(self):
+        n = 3 * HASH_BLOCK + 10
+        components = [0.0] * n
+        components[5] = components[2 * HASH_BLOCK + 1] = components[-1] = 1.5
+        sparse, dense = SparseVector(components), Vector(components)
+        assert sparse == dense
+        assert hash(sparse) == hash(dense)
+        assert sparse != Vector(components[:-1] + [0.0])
+        assert sparse != SparseVector(components[:-1])
+
+    def test_frombytes(self, sparse, dense):
+        restored = SparseVector.frombytes(bytes(dense))
+        assert type(restored) is SparseVector
+        assert list(restored.items()) == list(sparse.items())
+
+    def test_slicing(self, sparse, dense):
+        for index in (slice(1, 5), slice(None, None, 2), slice(None, None, -1), slice(10, 20)):
+            assert type(sparse[index]) is SparseVector
+            assert sparse[index] == dense[index]
+
+    def test_shortcut_names(self, sparse):
+        assert (sparse.x, sparse.y, sparse.z) == (0.0, 3.0, 0.0)
+        h = hash(sparse)
+        sparse.x = 1
+        sparse.y = 0
+        assert list(sparse.items()) == [(0, 1.0), (4, 4.0)]
+        assert hash(sparse) == hash(Vector([1, 0, 0, 0, 4, 0])) != h
+        assert abs(sparse) == abs(Vector([1, 4]))
+        with pytest.raises(AttributeError):
+            SparseVector([1]).y
+
+    def test_copy_and_pickle(self, sparse):
+        for clone in (copy.copy(sparse), copy.deepcopy(sparse), pickle.loads(pickle.dumps(sparse))):
+            assert clone == sparse and type(clone) is SparseVector
+            clone.y = 7
+            assert sparse.y == 3.0
+
+    def test_sparse_arithmetic_stays_sparse(self):
+        a = SparseVector({1: 1, 900: 2}, length=1000)
+        b = SparseVector({1: -1, 5: 3}, length=10)
+        total = a + b
+        assert type(total) is SparseVector
+        assert list(total.items()) == [(5, 3.0), (900, 2.0)]
+        assert a - b == Vector(a) - Vector(b)
+        assert type(-a) is SparseVector and -a == -Vector(a)
+        assert type(a * 2) is SparseVector and a * 2 == Vector(a) * 2 == 2 * a
+        assert list((a * 0).items()) == []
+        assert a @ b == -1.0
+        assert b @ a == -1.0
+
+    def test_dense_results_when_dense(self):
+        a = SparseVector([1, 0, 2, 0])
+        b = SparseVector([0, 1, 0, 3])
+        assert type(a + b) is Vector
+        assert a + b == Vector([1, 1, 2, 3])
+
+    def test_mixed_arithmetic(self, sparse, dense):
+        other = Vector([1, 1, 1])
+        for result, expected in [
+                (sparse + other, dense + other), (other + sparse, other + dense),
+                (sparse - other, dense - other), (other - sparse, other - dense),
+                (sparse + [1, 2], dense + [1, 2])]:
+            assert type(result) is Vector
+            assert result == expected
+        assert sparse @ other == other @ sparse == dense @ other
+        assert sparse @ dense == 25.0
+
+    def test_unsupported_operands(self, sparse):
+        with pytest.raises(TypeError):
+            sparse + 1
+        with pytest.raises(TypeError):
+            sparse * 'a'
+
+    def test_frozen_subclass(self):
+        class FrozenSparse(SparseVector):
+            __slots__ = ()
+            frozen = True
+        v = FrozenSparse([1, 2])
+        with pytest.raises(AttributeError):
+            v.x = 0
+        assert v == FrozenVector([1, 2])
+
+    def test_in_place_operators(self, sparse, dense):
+        original = sparse
+        sparse += SparseVector({0: 1}, length=6)
+        assert sparse is not original
+        assert sparse == dense + Vector([1])
+        dense += original
+        assert dense == Vector([0, 6, 0, 0, 8, 0])
+        long = SparseVector({3: 1}, length=100)
+        long += SparseVector({5: 1}, length=100)
+        assert type(long) is SparseVector
+        assert type(SparseVector.sum([long, long])) is SparseVector
+
+    def test_division_stays_sparse(self, sparse, dense):
+        quotient = sparse / 2
+        assert type(quotient) is SparseVector
+        assert quotient == dense / 2
+        long = SparseVector({3: 1, 70: 5}, length=100)
+        long /= 4
+        assert type(long) is SparseVector
+        assert list(long.items()) == [(3, 0.25), (70, 1.25)]
+        with pytest.raises(ZeroDivisionError):
+            sparse / 0
+        with pytest.raises(TypeError):
+            sparse / 'a'
+
+    def test_results_have_the_dense_bytes(self, sparse, dense):
+        other = Vector([1, 0, 0, 2, 0, 0, 0])
+        for result, expected in [
+                (sparse - other, dense - other), (other - sparse, other - dense),
+                (sparse + other, dense + other)]:
+            assert bytes(result) == bytes(expected)
+        for scalar in [float('nan'), float('inf'), float('-inf')]:
+            product = sparse * scalar
+            assert type(product) is Vector
+            assert bytes(product) == bytes(dense * scalar)
+        assert bytes(sparse / float('nan')) == bytes(dense / float('nan'))
+        assert type(sparse / float('inf')) is SparseVector
@@ -1,7 +1,12 @@
+import copy
 import math
+import pickle
+import sys
+from array import array
+
 import pytest
 
-from .vector import Vector, ShortVector
+from .vector import Vector, ShortVector, FrozenVector, RunningMean
 
 
 class TestVector:
@@ -53,6 +58,29 @@ class TestVector:
         vl3 = Vector.frombytes(octets)
         assert vl3 == vec_len_3
 
+    def test_bytes(self, vec_len_3):
+        assert bytes(vec_len_3) == b'd' + array('d', [1, 2, 3]).tobytes()
+        assert Vector.frombytes(bytes(ShortVector([0.5, 2]))) == Vector([0.5, 2])
+        with pytest.raises(ValueError):
+            Vector.frombytes(b'd123')
+
+    def test_frombuffer_shares_memory(self):
+        components = array('d', [1, 2, 3])
+        v = Vector.frombuffer(components)
+        assert v == Vector([1, 2, 3])
+        components[0] = 10
+        assert v.x == 10
+        v.y = 20
+        assert components[1] == 20
+        assert Vector.frombuffer(components.tobytes()) == v
+        assert bytes(v) == bytes(Vector([10, 20, 3]))
+
+    @pytest.mark.skipif(sys.version_info < (3, 12), reason='PEP 688 buffer protocol')
+    def test_buffer_protocol(self, vec_len_3):
+        memv = memoryview(vec_len_3)
+        assert memv.format == 'd'
+        assert memv.tolist() == [1, 2, 3]
+
     def test_len(self, vec_1, vec_len_3, null_vec):
         assert len(vec_1) == 2
         assert len(vec_len_3) == 3
@@ -90,6 +118,36 @@ class TestVector:
         v.x = 10
         assert v.x == 10
         assert v[0] == 10
+        w = Vector(range(2))
+        with pytest.raises(AttributeError):
+            w.z = 1
+
+    def test_shortcut_names_of_subclass(self):
+        class Vector3d(Vector):
+            shortcut_names = 'uvw'
+        v = Vector3d([1, 2, 3])
+        assert (v.u, v.v, v.w) == (1, 2, 3)
+        v.w = 10
+        assert v[2] == 10
+        assert Vector([1]).x == 1
+
+    def test_subclass_hides_unused_shortcut_names(self):
+        class Vector2d(Vector):
+            shortcut_names = 'ab'
+        v = Vector2d([1, 2, 3])
+        assert (v.a, v.b) == (1, 2)
+        for name in 'xyzt':
+            assert not hasattr(v, name)
+            with pytest.raises(AttributeError):
+                setattr(v, name, 0)
+        assert v == Vector([1, 2, 3])
+
+        class Vector4d(Vector2d):
+            shortcut_names = 'xyab'
+        w = Vector4d([1, 2, 3, 4])
+        assert (w.x, w.y, w.a, w.b) == (1, 2, 3, 4)
+        assert not hasattr(w, 'z')
+        assert Vector([1, 2, 3]).z == 3
 
     def test_get_class_attributes(self):
         v = Vector(range(10))
@@ -97,9 +155,64 @@ class TestVector:
         assert v.shortcut_names == 'xyzt'
 
     def test_hash(self):
-        assert hash(Vector([])) == 0
-        assert hash(Vector([1])) == 1
-        assert hash(Vector([0, 1])) == 1
+        assert hash(Vector([])) == hash(())
+        assert hash(Vector([1, 2])) == hash((1.0, 2.0))
+        assert hash(Vector([1, 2])) != hash(Vector([2, 1]))
+        assert hash(Vector([1, 1])) != hash(Vector([2, 2]))
+        assert hash(Vector([1, 2])) == hash(ShortVector([1, 2]))
+
+    def test_hash_of_long_vectors(self):
+        v = Vector(range(3000))
+        assert hash(v) == hash(Vector(range(3000)))
+        assert hash(v) != hash(Vector(reversed(range(3000))))
+
+    def test_eq_compares_lengths(self):
+        assert Vector([1, 2]) != Vector([1, 2, 0])
+        assert Vector([1, 2, 0]) != Vector([1, 2])
+
+    def test_shortcut_writes_reset_cached_hash_and_norm(self):
+        v = Vector([3, 4])
+        assert abs(v) == 5.0
+        h = hash(v)
+        v.x = 0
+        assert abs(v) == 4.0
+        assert hash(v) != h
+        assert hash(v) == hash(Vector([0, 4]))
+        v.y = 0
+        assert bool(v) is False
+
+    def test_copy_shares_components_until_written(self):
+        v = Vector([3, 4])
+        w = copy.copy(v)
+        assert w == v and w is not v
+        assert w._components is v._components
+        w.x = 0
+        assert w._components is not v._components
+        assert v == Vector([3, 4])
+        assert w == Vector([0, 4])
+        v.y = 1
+        assert v == Vector([3, 1])
+        assert w == Vector([0, 4])
+
+    def test_copy_of_frombuffer_vector_owns_its_array(self):
+        buffer = array('d', [1, 2])
+        w = copy.copy(Vector.frombuffer(buffer))
+        buffer[0] = 5
+        assert w == Vector([1, 2])
+
+    def test_deepcopy(self):
+        v = ShortVector([1, 2, 3])
+        w = copy.deepcopy([v, v])
+        assert w[0] is w[1]
+        assert type(w[0]) is ShortVector
+        assert w[0] == v
+        assert w[0]._components is not v._components
+
+    def test_pickle(self):
+        for v in (Vector([1, 2, 3]), ShortVector([1, 2]), FrozenVector([3, 4])):
+            w = pickle.loads(pickle.dumps(v))
+            assert type(w) is type(v)
+            assert w == v
 
     def test_pos(self, vec_1):
         assert +vec_1 == Vector([3, 4])
@@ -138,6 +251,211 @@ class TestVector:
             Vector([4, 5, 6]) * v1
             assert str(e) == "unsupported operand type(s) for +: 'Vector' and 'Vector'"
 
+    def test_sub(self):
+        v1 = Vector([1, 2, 3])
+        v2 = Vector([1, 1, 1, 1])
+        assert v1 - v2 == Vector([0, 1, 2, -1])
+        assert v2 - v1 == Vector([0, -1, -2, 1])
+        assert v1 - (1, 1) == Vector([0, 1, 3])
+        assert (1, 1) - v1 == Vector([0, -1, -3])
+        with pytest.raises(TypeError):
+            v1 - 1
+
+    def test_dot_product(self):
+        v1 = Vector([1, 2, 3])
+        assert v1 @ Vector([4, 5, 6]) == 32
+        assert v1 @ Vector([4, 5]) == 14
+        assert (4, 5, 6) @ v1 == 32
+        with pytest.raises(TypeError):
+            v1 @ 2
+
+
+class TestNumpyBackend:
+    @pytest.fixture(autouse=True)
+    def numpy_for_every_size(self, monkeypatch):
+        pytest.importorskip('numpy')
+        monkeypatch.setattr(Vector, 'numpy_threshold', 1)
+
+    @pytest.fixture
+    def pure_python(self, monkeypatch):
+        from . import vector
+        def disable():
+            monkeypatch.setattr(vector, 'np', None)
+        return disable
+
+    @pytest.fixture
+    def vectors(self):
+        return (Vector([1.5, -0.0, 3.25, 1e300]), Vector([0.1, 0.2, -0.0]),
+                ShortVector([1 / 3, 2 / 3]))
+
+    def test_matches_pure_python(self, vectors, pure_python):
+        a, b, c = vectors
+        expressions = [
+            lambda: a + b, lambda: b + a, lambda: a + c, lambda: a - b,
+            lambda: b - a, lambda: -a, lambda: a * 3, lambda: 0.5 * c,
+            lambda: a @ b, lambda: a == b, lambda: a == Vector(a),
+        ]
+        numpy_results = [f() for f in expressions]
+        pure_python()
+        for numpy_result, f in zip(numpy_results, expressions):
+            pure_result = f()
+            assert type(numpy_result) is type(pure_result)
+            if isinstance(pure_result, Vector):
+                assert bytes(numpy_result) == bytes(pure_result)
+            else:
+                assert numpy_result == pure_result
+
+    def test_abs(self, vectors):
+        _, b, _ = vectors
+        assert abs(Vector([3, 4])) == 5.0
+        assert abs(b) == pytest.approx(math.sqrt(0.05))
+        assert bool(Vector([0, 0])) is False
+
+
+class TestInPlaceOperators:
+    def test_updates_the_same_vector(self):
+        v = Vector([1, 2])
+        components = v._components
+        w = v
+        v += Vector([10, 20])
+        v -= [1, 1]
+        v *= 2
+        v /= 4
+        assert v is w
+        assert v._components is components
+        assert v == Vector([5, 10.5])
+
+    def test_extends_to_the_longer_operand(self):
+        v = Vector([1])
+        v += Vector([1, 2, 3])
+        assert v == Vector([2, 2, 3])
+        v -= Vector([0, 0, 0, 4])
+        assert v == Vector([2, 2, 3, -4])
+        v += Vector([1])
+        assert v == Vector([3, 2, 3, -4])
+
+    def test_resets_caches(self):
+        v = Vector([3, 4])
+        assert abs(v) == 5.0 and hash(v) == hash(Vector([3, 4]))
+        v *= 2
+        assert abs(v) == 10.0
+        assert hash(v) == hash(Vector([6, 8]))
+
+    def test_detaches_shared_copies(self):
+        v = Vector([1, 2])
+        w = copy.copy(v)
+        v += Vector([1, 1])
+        assert v == Vector([2, 3])
+        assert w == Vector([1, 2])
+
+    def test_frozen_vectors_are_rebound(self):
+        v = FrozenVector([1, 2])
+        w = v
+        v += Vector([1, 1])
+        assert v is not w
+        assert w == Vector([1, 2])
+        assert v == Vector([2, 3])
+        w /= 2
+        assert w == Vector([0.5, 1])
+
+    def test_frombuffer_vectors(self):
+        buffer = array('d', [1, 2])
+        v = Vector.frombuffer(buffer)
+        v *= 3
+        assert buffer == array('d', [3, 6])
+        v += Vector([0, 0, 1])  # no longer fits in the buffer
+        assert v == Vector([3, 6, 1])
+        assert buffer == array('d', [3, 6])
+        readonly = Vector.frombuffer(bytes(array('d', [1, 2])))
+        readonly += Vector([1, 1])
+        assert readonly == Vector([2, 3])
+
+    def test_numpy_path(self):
+        pytest.importorskip('numpy')
+
+        class NumpyVector(Vector):
+            __slots__ = ()
+            numpy_threshold = 2
+        v = NumpyVector([1, 2, 3])
+        v += Vector([1, 1])
+        v -= [0, 0, 0, 1]
+        v *= 2
+        v /= 4
+        assert v == Vector([1, 1.5, 1.5, -0.5])
+        short = ShortVector([1, 2])
+        short += Vector([0.5, 0.25])
+        assert short == ShortVector([1.5, 2.25])
+
+    def test_errors(self):
+        v = Vector([1, 2])
+        with pytest.raises(TypeError):
+            v += 1
+        with pytest.raises(TypeError):
+            v *= 'a'
+        with pytest.raises(ZeroDivisionError):
+            v /= 0
+        assert v == Vector([1, 2])
+
+    def test_truediv(self):
+        assert Vector([1, 2]) / 2 == Vector([0.5, 1])
+
+    def test_sum(self):
+        vectors = [Vector([i, i]) for i in range(10)] + [Vector([0, 0, 1])]
+        assert Vector.sum(vectors) == Vector([45, 45, 1])
+        assert Vector.sum(vectors) == sum(vectors, Vector([]))
+        assert Vector.sum([]) == Vector([])
+        total = FrozenVector.sum(vectors)
+        assert type(total) is FrozenVector and total == Vector([45, 45, 1])
+        assert vectors[0] == Vector([0, 0])
+
+    def test_running_mean(self):
+        mean = RunningMean()
+        with pytest.raises(ValueError):
+            mean.mean()
+        mean.extend([Vector([1, 2]), Vector([3, 4, 6])])
+        assert mean.count == 2
+        assert mean.mean() == Vector([2, 3, 3])
+        mean.push(Vector([2, 3]))
+        assert mean.mean() == Vector([2, 3, 2])
+
+    def test_single_precision_sum_and_mean(self):
+        vectors = [ShortVector([i, 0.5]) for i in range(4)]
+        total = ShortVector.sum(vectors)
+        assert type(total) is ShortVector and total == ShortVector([6, 2])
+        mean = RunningMean('f')
+        mean.extend(vectors)
+        assert type(mean.mean()) is ShortVector
+        assert mean.mean() == ShortVector([1.5, 0.5])
+        mean.push(Vector([2, 0.5]))
+        assert mean.mean() == ShortVector([1.6, 0.5])
+        with pytest.raises(ValueError):
+            RunningMean('i')
+
+    def test_single_precision_sum_with_numpy(self):
+        pytest.importorskip('numpy')
+        n = ShortVector.numpy_threshold
+        total = ShortVector.sum([ShortVector([1] * n), Vector([0.5] * n)])
+        assert type(total) is ShortVector and total == ShortVector([1.5] * n)
+        mean = RunningMean('f')
+        mean.extend([ShortVector([1] * n), ShortVector([2] * n)])
+        assert mean.mean() == ShortVector([1.5] * n)
+
+
+class TestFrozenVector:
+    def test_cannot_assign_shortcuts(self):
+        v = FrozenVector([3, 4])
+        with pytest.raises(AttributeError):
+            v.x = 0
+        assert v == Vector([3, 4])
+
+    def test_caches_hash_and_norm(self):
+        v = FrozenVector([3, 4])
+        assert abs(v) == abs(v) == 5.0
+        assert hash(v) == hash(Vector([3, 4]))
+        assert {v: 1}[FrozenVector([3, 4])] == 1
+        assert bool(v) is True
+        assert bool(FrozenVector([0, 0])) is False
+
 
 class TestShortVector:
     @pytest.fixture
@@ -1,18 +1,94 @@
+import copy
 import math
 import itertools
 from array import array
-from functools import reduce
-from operator import xor
+from operator import add, mul, sub, truediv
 from typing import Iterable, Union
 import numbers
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the array('d') code below is the fallback
+    np = None
+
+
+HASH_BLOCK = 1024  # components are hashed as tuples of at most this many
+
+
+class ShortcutComponent:
+    """Reads and writes the component of a Vector at a fixed index"""
+    def __init__(self, index: int):
+        self.index = index
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def _missing(self, instance):
+        return AttributeError(
+            f'{type(instance).__name__!r} object has no attribute {self.name!r}')
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance._components[self.index]
+        except IndexError:
+            raise self._missing(instance) from None
+
+    def __set__(self, instance, value) -> None:
+        if instance.frozen:
+            raise AttributeError(
+                f'cannot assign to {self.name!r} of frozen {type(instance).__name__!r}')
+        if instance._shared:
+            instance._detach()
+        try:
+            instance._components[self.index] = value
+        except IndexError:
+            raise self._missing(instance) from None
+        instance._hash = instance._norm = None
+
+
+class HiddenShortcut:
+    """Hides a shortcut name inherited by a subclass that does not use it"""
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def _missing(self, owner):
+        return AttributeError(f'{owner.__name__!r} object has no attribute {self.name!r}')
+
+    def __get__(self, instance, owner=None):
+        raise self._missing(owner or type(instance))
+
+    def __set__(self, instance, value) -> None:
+        raise self._missing(type(instance))
+
+
+def _install_shortcuts(cls):
+    for index, name in enumerate(cls.shortcut_names):
+        descriptor = cls.shortcut_class(index)
+        descriptor.__set_name__(cls, name)
+        setattr(cls, name, descriptor)
+    inherited = {name for base in cls.__mro__[1:] for (name, attr) in vars(base).items()
+                 if isinstance(attr, ShortcutComponent)}
+    for name in inherited.difference(cls.shortcut_names, vars(cls)):
+        hidden = HiddenShortcut()
+        hidden.__set_name__(cls, name)
+        setattr(cls, name, hidden)
+
 
 class Vector:
+    __slots__ = ('_components', '_hash', '_norm', '_shared', '__weakref__')
     typecode = 'd'  # needed to convert to/from bytes
     shortcut_names = 'xyzt'
+    shortcut_class = ShortcutComponent  # descriptor type installed for each shortcut name
+    frozen = False
+    numpy_threshold = 10_000  # use NumPy for vectors with at least this many components
 
     def __init__(self, components: Iterable):
         self._components = array(self.typecode, components)
+        self._hash = self._norm = None  # caches, reset by shortcut writes
+        self._shared = False  # whether a copy may be using the same array
 
     def __repr__(self):
         return f'{self.__class__.__name__}(' + ', '.join((str(c) for c in self._components)) + ')'
@@ -24,21 +100,51 @@ class Vector:
         return iter(self._components)
 
     def __bytes__(self):
-        return (bytes([ord(self.typecode)]) +
-            bytes(array(self.typecode, self)))
+        return b''.join((bytes([ord(self.typecode)]), self._components))
+
+    def __buffer__(self, flags):
+        # buffer protocol from Python 3.12 on (PEP 688)
+        return memoryview(self._components)
 
     def __eq__(self, other: 'Vector2d'):
+        if len(self) != len(other):
+            return False
+        if self._uses_numpy(other):
+            return bool(np.array_equal(self._ndarray(), other._ndarray()))
         return all(c1 == c2 for (c1, c2) in zip(self._components, other._components))
 
     def __hash__(self):
-        hashes = map(hash, self._components)
-        return reduce(xor, hashes, 0)
+        if self._hash is None:
+            components = self._components
+            if len(components) <= HASH_BLOCK:
+                self._hash = hash(tuple(components))
+            else:
+                # hash of the block hashes, so that blocks can be hashed in parallel
+                blocks = (hash(tuple(components[i:i + HASH_BLOCK]))
+                          for i in range(0, len(components), HASH_BLOCK))
+                self._hash = hash(tuple(blocks))
+        return self._hash
 
     def __abs__(self):
-        return math.sqrt(sum(e**2 for e in self))
+        if self._norm is None:
+            if self._uses_numpy():
+                values = self._ndarray()
+                self._norm = math.sqrt(np.dot(values, values))
+            else:
+                self._norm = math.sqrt(sum(e**2 for e in self))
+        return self._norm
 
     def __bool__(self):
-        return abs(self) > 0
+        if self._norm is not None:
+            return self._norm > 0
+        return any(self._components)
+
+    def __sizeof__(self):
+        # sys.getsizeof counts the components too, so that caches can budget by size
+        components = self._components
+        if isinstance(components, array):
+            return object.__sizeof__(self) + components.__sizeof__()
+        return object.__sizeof__(self) + components.nbytes  # a view keeps its buffer alive
 
     def __len__(self):
         return len(self._components)
@@ -51,37 +157,41 @@ class Vector:
         else:
             raise TypeError(f'Invalid input to __getitem__ {index} of type {type(index)}.')
 
-    @property
-    def _lookup_index(self):
-        return dict(
-            zip(self.shortcut_names, range(len(self._components))))
-
-    def __getattr__(self, attr: str) -> float:
-        cls = type(self)
-        if attr in set(cls.shortcut_names):
-            try:
-                return self._components[self._lookup_index[attr]]
-            except KeyError:
-                raise AttributeError
-        return super().__getattr__(attr)
-
-    def __setattr__(self, attr: str, value) -> None:
-        cls = type(self)
-        if attr in set(cls.shortcut_names):
-            self._components[self._lookup_index[attr]] = value
-        else:
-            super().__setattr__(attr, value)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'shortcut_names' in cls.__dict__ or 'shortcut_class' in cls.__dict__:
+            _install_shortcuts(cls)
+
+    # NumPy backend
+    def _uses_numpy(self, *others):
+        return (np is not None
+                and all(isinstance(other, Vector) for other in others)
+                and max(map(len, (self, *others))) >= self.numpy_threshold)
+
+    def _ndarray(self):
+        # a float64 view of the components, copied only for other typecodes
+        return np.frombuffer(self._components, dtype=self.typecode).astype('d', copy=False)
+
+    @staticmethod
+    def _fromndarray(values):
+        components = array('d')
+        components.frombytes(memoryview(np.ascontiguousarray(values, dtype='d')).cast('B'))
+        return Vector._fromcomponents(components)
 
     # unary operators
     def __pos__(self):
         return Vector(self)
 
     def __neg__(self):
+        if self._uses_numpy():
+            return self._fromndarray(-self._ndarray())
         return Vector(-x for x in self)
 
     # infix operators
     def __add__(self, other):
         # return self._add_fluent_python_version(other)
+        if self._uses_numpy(other):
+            return self._add_numpy_version(other)
         try:
             return self._add_my_version(other)
         except TypeError:
@@ -101,27 +211,245 @@ class Vector:
         pairs = itertools.zip_longest(self, other, fillvalue=0.0)
         return Vector(a + b for (a, b) in pairs)
 
+    def _add_numpy_version(self, other):
+        # the tail of the longer vector is copied, not added to zeros,
+        # so that -0.0 survives exactly as in _add_my_version
+        longer, shorter = sorted((self, other), key=len, reverse=True)
+        result = longer._ndarray().copy()
+        result[:len(shorter)] += shorter._ndarray()
+        return self._fromndarray(result)
+
     def __radd__(self, other):
         return self + other
 
+    def __sub__(self, other):
+        if self._uses_numpy(other):
+            return self._sub_numpy_version(other)
+        try:
+            pairs = itertools.zip_longest(self, other, fillvalue=0.0)
+            return Vector(a - b for (a, b) in pairs)
+        except TypeError:
+            return NotImplemented
+
+    def __rsub__(self, other):
+        try:
+            pairs = itertools.zip_longest(other, self, fillvalue=0.0)
+            return Vector(a - b for (a, b) in pairs)
+        except TypeError:
+            return NotImplemented
+
+    def _sub_numpy_version(self, other):
+        n = max(len(self), len(other))
+        a, b = np.zeros(n), np.zeros(n)
+        a[:len(self)] = self._ndarray()
+        b[:len(other)] = other._ndarray()
+        return self._fromndarray(a - b)
+
     def __mul__(self, scalar):
         if not isinstance(scalar, numbers.Real):
             return NotImplemented
+        if self._uses_numpy():
+            return self._fromndarray(self._ndarray() * float(scalar))
         return Vector([x * scalar for x in self])
 
     def __rmul__(self, scalar):
         return self * scalar
 
+    def __truediv__(self, scalar):
+        if not isinstance(scalar, numbers.Real):
+            return NotImplemented
+        if self._uses_numpy():
+            if not scalar:
+                raise ZeroDivisionError('division by zero')
+            return self._fromndarray(self._ndarray() / float(scalar))
+        return Vector([x / scalar for x in self])
+
+    # in-place operators, falling back to the infix ones when they return NotImplemented
+    def _writable_components(self, length):
+        """The components, extended with zeros to at least length, ready to be
+        updated in place; None if the vector cannot change in place."""
+        if self.frozen:
+            return None
+        if self._shared:
+            self._detach()
+        components = self._components
+        if not isinstance(components, array) and (components.readonly or length > len(components)):
+            # a frombuffer view can only be written to while it fits in its buffer
+            components = self._components = self._copy_components()
+        if length > len(components):
+            components.frombytes(bytes((length - len(components)) * components.itemsize))
+        self._hash = self._norm = None
+        return components
+
+    def _update(self, op, ufunc, other):
+        try:
+            values = other._components if isinstance(other, Vector) else array(self.typecode, other)
+        except TypeError:
+            return NotImplemented
+        n = len(values)
+        components = self._writable_components(n)
+        if components is None:
+            return NotImplemented
+        if np is not None and len(components) >= self.numpy_threshold:
+            target = np.frombuffer(components, dtype=self.typecode)[:n]
+            source = other._ndarray() if isinstance(other, Vector) else np.frombuffer(values, dtype=self.typecode)
+            ufunc(target, source, out=target)
+        else:
+            components[:n] = array(self.typecode, map(op, components, values))
+        return self
+
+    def _scale(self, op, ufunc, scalar):
+        if not isinstance(scalar, numbers.Real):
+            return NotImplemented
+        if op is truediv and not scalar:
+            raise ZeroDivisionError('division by zero')
+        components = self._writable_components(0)
+        if components is None:
+            return NotImplemented
+        if np is not None and len(components) >= self.numpy_threshold:
+            target = np.frombuffer(components, dtype=self.typecode)
+            ufunc(target, float(scalar), out=target)
+        else:
+            components[:] = array(self.typecode, map(op, components, itertools.repeat(scalar)))
+        return self
+
+    def __iadd__(self, other):
+        return self._update(add, np and np.add, other)
 
+    def __isub__(self, other):
+        return self._update(sub, np and np.subtract, other)
 
+    def __imul__(self, scalar):
+        return self._scale(mul, np and np.multiply, scalar)
 
+    def __itruediv__(self, scalar):
+        return self._scale(truediv, np and np.true_divide, scalar)
+
+    @classmethod
+    def sum(cls, vectors):
+        """Sum of vectors, accumulated in place in a single array"""
+        total = _accumulator(cls.typecode)
+        for v in vectors:
+            total += v
+        return cls._fromcomponents(total._components)
+
+    def __matmul__(self, other):
+        """Dot product, over the components the two vectors have in common"""
+        if self._uses_numpy(other):
+            n = min(len(self), len(other))
+            return float(np.dot(self._ndarray()[:n], other._ndarray()[:n]))
+        try:
+            return sum(a * b for (a, b) in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __rmatmul__(self, other):
+        return self @ other
+
+    @classmethod
+    def _fromcomponents(cls, components):
+        # wraps an array or memoryview of cls.typecode items without copying it
+        vector = cls.__new__(cls)
+        vector._components = components
+        vector._hash = vector._norm = None
+        vector._shared = False
+        return vector
+
+    def _copy_components(self):
+        components = self._components
+        if isinstance(components, array):
+            return components[:]
+        clone = array(self.typecode)
+        clone.frombytes(components.cast('B'))
+        return clone
+
+    def _detach(self):
+        # called before a write to an array that a copy may share
+        self._components = self._copy_components()
+        self._shared = False
+
+    def __copy__(self):
+        """Copy sharing the components array until either side writes to it"""
+        if not isinstance(self._components, array):
+            # a frombuffer view stays tied to its buffer, the copy gets its own array
+            return self.__deepcopy__({})
+        clone = self._fromcomponents(self._components)
+        clone._hash, clone._norm = self._hash, self._norm
+        self._shared = clone._shared = True
+        return clone
+
+    def __deepcopy__(self, memo):
+        clone = memo[id(self)] = self._fromcomponents(self._copy_components())
+        clone._hash, clone._norm = self._hash, self._norm
+        return clone
+
+    def __reduce__(self):
+        return type(self).frombytes, (bytes(self),)
 
     @classmethod
     def frombytes(cls, octets):
         typecode = chr(octets[0])
-        memv = memoryview(octets[1:]).cast(typecode)
-        return cls(memv)
+        if typecode != cls.typecode:
+            return cls(memoryview(octets)[1:].cast(typecode))
+        components = array(typecode)
+        components.frombytes(memoryview(octets)[1:])
+        return cls._fromcomponents(components)
+
+    @classmethod
+    def frombuffer(cls, buffer):
+        """Vector sharing memory with a buffer of raw cls.typecode items.
+
+        Writes made through the buffer itself do not reset the cached hash
+        and norm of the vector.
+        """
+        memv = memoryview(buffer)
+        if memv.format != cls.typecode:
+            memv = memv.cast('B').cast(cls.typecode)
+        return cls._fromcomponents(memv)
+
+
+_install_shortcuts(Vector)
 
 
 class ShortVector(Vector):
-    typecode = 'f'
\ No newline at end of file
+    __slots__ = ()
+    typecode = 'f'
+
+
+class FrozenVector(Vector):
+    """Vector whose shortcut components cannot be reassigned"""
+    __slots__ = ()
+    frozen = True
+
+
+def _accumulator(typecode):
+    # an empty, writable vector of typecode items for in-place sums
+    for cls in (Vector, ShortVector):
+        if cls.typecode == typecode:
+            return cls._fromcomponents(array(typecode))
+    raise ValueError(f'Unsupported typecode {typecode!r}, expected one of \'d\' or \'f\'.')
+
+
+class RunningMean:
+    """Componentwise mean of a stream of vectors, accumulated in place.
+
+    Shorter vectors count as padded with zeros, as in Vector addition.
+    """
+    def __init__(self, typecode='d'):
+        self.count = 0
+        self._total = _accumulator(typecode)
+
+    def push(self, vector):
+        self._total += vector
+        self.count += 1
+
+    def extend(self, vectors):
+        for v in vectors:
+            self.push(v)
+
+    def mean(self) -> Vector:
+        if not self.count:
+            raise ValueError('mean of no vectors')
+        mean = copy.copy(self._total)
+        mean /= self.count
+        return mean
@@ -1,16 +1,21 @@
-from collections import defaultdict
+from collections import defaultdict, namedtuple, OrderedDict
 from itertools import chain
+from threading import Lock
+from time import monotonic
 import functools
+import sys
+import weakref
 
 
 def count_calls(dictionary):
     """Decorator that registers function calls in a dictionary"""
     def decorator(f):
-        if f.__name__ not in dictionary:
-            dictionary[f.__name__] = 0
-        functools.wraps(f)
-        def call(*args, **kwargs): 
-            dictionary[f.__name__] += 1 
+        name = f.__name__
+        if name not in dictionary:
+            dictionary[name] = 0
+        @functools.wraps(f)
+        def call(*args, **kwargs):
+            dictionary[name] += 1
             return f(*args, **kwargs)
         return call
     return decorator
@@ -19,11 +24,116 @@ def count_calls(dictionary):
 def count_calls_by_signature(dictionary):
     def decorator(f):
         if f.__name__ not in dictionary:
-            dictionary[f.__name__] = defaultdict(lambda: 0)
-        functools.wraps(f)
+            dictionary[f.__name__] = defaultdict(int)
+        counts = dictionary[f.__name__]
+        @functools.wraps(f)
         def call(*args, **kwargs):
             key = '(' + ', '.join(chain((str(arg) for arg in args), sorted(f'{k}={v}' for k, v in kwargs.items()))) + ')'
-            dictionary[f.__name__][key] += 1
+            counts[key] += 1
             return f(*args, **kwargs)
         return call
     return decorator
+
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses evictions currsize nbytes')
+
+_KWD_MARK = object()  # separates positional from keyword arguments in cache keys
+
+
+def _make_key(args, kwargs):
+    if not kwargs:
+        return args
+    return args + (_KWD_MARK, frozenset(kwargs.items()))
+
+
+def memoize(maxsize=128, ttl=None, max_bytes=None, weak=False, sizeof=sys.getsizeof):
+    """Decorator that caches results by arguments.
+
+    The least recently used entries are evicted beyond maxsize entries or
+    max_bytes bytes, as measured by sizeof, and entries expire ttl seconds
+    after they were computed. With weak=True results are held through weak
+    references, like a WeakValueDictionary, and drop out of the cache once
+    nothing else refers to them; results that cannot be weakly referenced,
+    like ints and floats, are still held strongly. Arguments must be
+    hashable.
+    """
+    def decorator(f):
+        entries = OrderedDict()  # key -> (expires, nbytes), in LRU order
+        values = {}  # key -> value, for the results held strongly
+        refs = {}  # key -> weak reference, for the results held weakly
+        dead = []  # (key, reference) pairs whose referent was collected
+        stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'nbytes': 0}
+        lock = Lock()
+
+        def evict(key):
+            _, nbytes = entries.pop(key)
+            values.pop(key, None)
+            refs.pop(key, None)
+            stats['nbytes'] -= nbytes
+            stats['evictions'] += 1
+
+        def prune():
+            # the callbacks only append to dead, entries are evicted under the lock
+            while dead:
+                key, ref = dead.pop()
+                if refs.get(key) is ref:
+                    evict(key)
+
+        def store(key, value):
+            if weak:
+                try:
+                    refs[key] = weakref.ref(value, lambda ref, key=key: dead.append((key, ref)))
+                    return
+                except TypeError:
+                    pass
+            values[key] = value
+
+        @functools.wraps(f)
+        def call(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            with lock:
+                prune()
+                if key in entries:
+                    expires, _ = entries[key]
+                    ref = refs.get(key)
+                    value = values.get(key) if ref is None else ref()
+                    if (ref is not None and value is None) or (expires is not None and expires < monotonic()):
+                        evict(key)
+                    else:
+                        entries.move_to_end(key)
+                        stats['hits'] += 1
+                        return value
+                stats['misses'] += 1
+            value = f(*args, **kwargs)
+            nbytes = sizeof(value) if max_bytes is not None else 0
+            with lock:
+                prune()
+                if key in entries:
+                    evict(key)
+                    stats['evictions'] -= 1  # replaced by a concurrent call, not evicted
+                store(key, value)
+                entries[key] = (None if ttl is None else monotonic() + ttl, nbytes)
+                stats['nbytes'] += nbytes
+                while entries and ((maxsize is not None and len(entries) > maxsize) or
+                                   (max_bytes is not None and stats['nbytes'] > max_bytes)):
+                    evict(next(iter(entries)))
+            return value
+
+        def cache_info():
+            with lock:
+                prune()
+                return CacheInfo(stats['hits'], stats['misses'], stats['evictions'],
+                                 len(entries), stats['nbytes'])
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+                values.clear()
+                refs.clear()
+                dead.clear()
+                stats.update(hits=0, misses=0, evictions=0, nbytes=0)
+
+        call.cache_info = cache_info
+        call.cache_clear = cache_clear
+        return call
+    return decorator
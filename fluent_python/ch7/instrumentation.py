@@ -0,0 +1,115 @@
+"""Call counting decorators that are cheap enough to leave on.
+
+Counters live in the decorator's closure instead of a shared dictionary.
+Every thread increments its own entry, keyed by thread id, so no lock is
+taken on the call path, and the entries are merged when the counts are
+read.
+"""
+import functools
+from threading import get_ident
+
+
+def _merge(per_thread):
+    merged = {}
+    for counts in list(per_thread.values()):
+        for key, n in list(counts.items()):
+            merged[key] = merged.get(key, 0) + n
+    return merged
+
+
+_KWD_MARK = object()  # separates positional from keyword arguments in keys
+_BY_VALUE = frozenset({int, float, complex, bool, type(None)})
+
+
+def _argument_key(x):
+    # numbers are small and their hashes collide easily, like hash(-1) and
+    # hash(-2), so they are kept by value; anything else is kept by hash,
+    # which is fixed when the call is counted and holds no reference to x
+    cls = type(x)
+    if cls in _BY_VALUE:
+        return cls, x
+    if cls is tuple:
+        return cls, tuple(map(_argument_key, x))
+    try:
+        return cls, hash(x)
+    except TypeError:
+        return cls, hash(repr(x))
+
+
+def signature_key(args, kwargs):
+    """Key identifying a call signature, independent of keyword order.
+
+    Each argument is keyed by its type and either its value, for numbers,
+    or its hash when the call is made, or the hash of its repr when it is
+    unhashable. The keys hold no references to the arguments, so counting
+    keeps none of them alive, and a Vector changed in place after a call
+    is counted under its new hash from then on. Arguments that are not
+    numbers and have the same type and hash share a key.
+    """
+    key = tuple(map(_argument_key, args))
+    if kwargs:
+        key += (_KWD_MARK, frozenset((k, _argument_key(v)) for (k, v) in kwargs.items()))
+    return key
+
+
+def count_calls(f):
+    """Decorator that counts calls to f; read the total with f.calls()"""
+    per_thread = {}
+
+    @functools.wraps(f)
+    def call(*args, **kwargs):
+        thread = get_ident()
+        try:
+            per_thread[thread] += 1
+        except KeyError:
+            per_thread[thread] = 1
+        return f(*args, **kwargs)
+
+    def calls():
+        return sum(list(per_thread.values()))
+
+    call.calls = calls
+    call.reset = per_thread.clear
+    return call
+
+
+def count_calls_by_signature(sample=1):
+    """Decorator that counts calls to f per signature.
+
+    Only signatures whose key hashes to a multiple of `sample` are counted,
+    which keeps roughly 1 in `sample` signatures, each of them counted
+    exactly.
+    Read the count of one signature with f.count(*args, **kwargs), or all
+    of them, keyed by signature_key, with f.counts().
+    """
+    if sample < 1:
+        raise ValueError(f'sample must be a positive integer, got {sample}.')
+
+    def decorator(f):
+        per_thread = {}
+
+        @functools.wraps(f)
+        def call(*args, **kwargs):
+            key = signature_key(args, kwargs)
+            if sample == 1 or hash(key) % sample == 0:
+                thread = get_ident()
+                try:
+                    counts = per_thread[thread]
+                except KeyError:
+                    counts = per_thread[thread] = {}
+                counts[key] = counts.get(key, 0) + 1
+            return f(*args, **kwargs)
+
+        def counts():
+            return _merge(per_thread)
+
+        def count(*args, **kwargs):
+            key = signature_key(args, kwargs)
+            return sum(counts.get(key, 0) for counts in list(per_thread.values()))
+
+        call.counts = counts
+        call.count = count
+        call.reset = per_thread.clear
+        call.sample = sample
+        return call
+    return decorator
@@ -1,4 +1,10 @@
-from ch7.decorators import count_calls, count_calls_by_signature
+import gc
+from unittest import mock
+
+import pytest
+
+from ch7.decorators import count_calls, count_calls_by_signature, memoize
+from ch10.vector import Vector
 
 class TestCountCalls:
     def test_single_calls(self):
@@ -68,3 +74,129 @@ class TestCountCallsBySignature:
         count_occurences_of_letter('b', sentence=sentence)
         assert counts[func_name][f'(a, sentence={sentence})'] == 3
         assert counts[func_name][f'(b, sentence={sentence})'] == 2
+
+
+class TestMemoize:
+    def test_caches_by_arguments(self):
+        calls = []
+        @memoize()
+        def power(base, exponent=2):
+            calls.append((base, exponent))
+            return base ** exponent
+        assert power(3) == 9
+        assert power(3) == 9
+        assert power(3, exponent=3) == 27
+        assert power(3, exponent=3) == 27
+        assert calls == [(3, 2), (3, 3)]
+        info = power.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+        assert power.__name__ == 'power'
+
+    def test_keyword_order_does_not_matter(self):
+        @memoize()
+        def f(a=0, b=0):
+            return a - b
+        f(a=1, b=2)
+        f(b=2, a=1)
+        assert f.cache_info().hits == 1
+
+    def test_lru_eviction(self):
+        @memoize(maxsize=2)
+        def square(a):
+            return a * a
+        square(1)
+        square(2)
+        square(1)
+        square(3)  # evicts 2, the least recently used
+        square(1)
+        assert square.cache_info().hits == 2
+        square(2)
+        info = square.cache_info()
+        assert info.misses == 4
+        assert info.evictions == 2
+        assert info.currsize == 2
+
+    def test_ttl(self):
+        now = [100.0]
+        with mock.patch('ch7.decorators.monotonic', lambda: now[0]):
+            @memoize(ttl=10)
+            def square(a):
+                return a * a
+            square(2)
+            now[0] += 5
+            square(2)
+            now[0] += 10
+            square(2)
+        info = square.cache_info()
+        assert (info.hits, info.misses, info.evictions) == (1, 2, 1)
+
+    def test_byte_budget(self):
+        @memoize(maxsize=None, max_bytes=250, sizeof=len)
+        def text(n):
+            return 'x' * n
+        text(100)
+        text(100)
+        text(200)  # over budget, evicts 100
+        info = text.cache_info()
+        assert info.nbytes == 200
+        assert info.currsize == 1
+        assert info.evictions == 1
+
+    def test_byte_budget_counts_vector_components(self):
+        @memoize(maxsize=None, max_bytes=100_000)
+        def zeros(n):
+            return Vector([0.0] * n)
+        for n in range(1000, 100_000, 1000):
+            zeros(n)
+        info = zeros.cache_info()
+        assert info.nbytes <= 100_000
+        assert info.currsize < 5
+        assert info.evictions > 90
+
+    def test_weak_values(self):
+        @memoize(weak=True)
+        def make_vector(*components):
+            return Vector(components)
+        v = make_vector(3, 4)
+        assert make_vector(3, 4) is v
+        del v
+        gc.collect()
+        make_vector(3, 4)
+        info = make_vector.cache_info()
+        assert (info.hits, info.misses) == (1, 2)
+
+    def test_weak_cache_holds_other_values_strongly(self):
+        @memoize(weak=True)
+        def half(a):
+            return a / 2
+        assert half(3) == 1.5
+        assert half(3) == 1.5
+        info = half.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    def test_weak_cache_prunes_collected_values(self):
+        @memoize(maxsize=None, weak=True)
+        def make_vector(*components):
+            return Vector(components)
+        for i in range(100):
+            make_vector(i)
+        gc.collect()
+        assert make_vector.cache_info().currsize == 0
+        v = make_vector(1)
+        assert make_vector.cache_info().currsize == 1
+        assert make_vector(1) is v
+
+    def test_cache_clear(self):
+        @memoize()
+        def square(a):
+            return a * a
+        square(1)
+        square.cache_clear()
+        assert square.cache_info() == (0, 0, 0, 0, 0)
+
+    def test_unhashable_arguments(self):
+        @memoize()
+        def total(values):
+            return sum(values)
+        with pytest.raises(TypeError):
+            total([1, 2])
@@ -0,0 +1,142 @@
+import gc
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ch7.instrumentation import count_calls, count_calls_by_signature, signature_key
+from ch10.vector import Vector
+
+
+class TestCountCalls:
+    def test_counts_calls(self):
+        @count_calls
+        def square(a):
+            """Squares a"""
+            return a * a
+        assert square.calls() == 0
+        assert [square(i) for i in range(3)] == [0, 1, 4]
+        assert square.calls() == 3
+        assert square.__name__ == 'square'
+        assert square.__doc__ == 'Squares a'
+        square.reset()
+        assert square.calls() == 0
+
+    def test_recursive_calls(self):
+        @count_calls
+        def fib(n):
+            if n <= 0:
+                return 0
+            elif n == 1:
+                return 1
+            return fib(n - 2) + fib(n - 1)
+        assert fib(5) == 5
+        assert fib.calls() == 15
+
+    def test_threads(self):
+        @count_calls
+        def noop():
+            pass
+        def call_many(_):
+            for _ in range(1000):
+                noop()
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(call_many, range(16)))
+        assert noop.calls() == 16000
+
+
+class TestCountCallsBySignature:
+    def test_positional_arguments(self):
+        @count_calls_by_signature()
+        def fib(n):
+            if n <= 0:
+                return 0
+            elif n == 1:
+                return 1
+            return fib(n - 2) + fib(n - 1)
+        fib(5)
+        assert [fib.count(n) for n in range(6)] == [3, 5, 3, 2, 1, 1]
+        assert fib.counts() == {signature_key((n,), {}): fib.count(n) for n in range(6)}
+
+    def test_keyword_arguments_in_any_order(self):
+        @count_calls_by_signature()
+        def count_occurences_of_letter(letter, sentence='', start=0):
+            return sentence.count(letter, start)
+        sentence = 'The quick brown fox jumped over the sleeping dog'
+        count_occurences_of_letter('a', sentence=sentence, start=1)
+        count_occurences_of_letter('a', start=1, sentence=sentence)
+        count_occurences_of_letter('b', sentence=sentence)
+        assert count_occurences_of_letter.count('a', sentence=sentence, start=1) == 2
+        assert count_occurences_of_letter.count('b', sentence=sentence) == 1
+        assert count_occurences_of_letter.count('b') == 0
+
+    def test_unhashable_arguments(self):
+        @count_calls_by_signature()
+        def total(values):
+            return sum(values)
+        total([1, 2])
+        total([1, 2])
+        assert total.count([1, 2]) == 2
+
+    def test_signatures_with_equal_hashes_are_counted_apart(self):
+        @count_calls_by_signature()
+        def identity(n):
+            return n
+        assert hash(-1) == hash(-2)
+        for n in [-1, -2, -2, 1, 1.0, 1.0, True, True, True]:
+            identity(n)
+        assert identity.count(-1) == 1
+        assert identity.count(-2) == 2
+        assert [identity.count(n) for n in (1, 1.0, True)] == [1, 2, 3]
+        assert len(identity.counts()) == 5
+
+    def test_arguments_are_not_kept_alive(self):
+        @count_calls_by_signature()
+        def norm(v):
+            return abs(v)
+        v = Vector([3, 4])
+        norm(v)
+        assert norm.count(Vector([3, 4])) == 1
+        ref = weakref.ref(v)
+        del v
+        gc.collect()
+        assert ref() is None
+        assert norm.count(Vector([3, 4])) == 1
+
+    def test_arguments_changed_in_place(self):
+        @count_calls_by_signature()
+        def norm(v):
+            return abs(v)
+        v = Vector([3, 4])
+        norm(v)
+        v.x = 6
+        norm(v)
+        norm(v)
+        assert norm.count(Vector([3, 4])) == 1
+        assert norm.count(v) == 2
+        assert sum(norm.counts().values()) == 3
+
+    def test_sampling(self):
+        @count_calls_by_signature(sample=4)
+        def identity(n):
+            return n
+        for n in range(100):
+            identity(n)
+            identity(n)
+        sampled = [n for n in range(100) if identity.count(n)]
+        assert 0 < len(sampled) < 100
+        assert all(identity.count(n) == 2 for n in sampled)
+        assert all(hash(signature_key((n,), {})) % 4 == 0 for n in sampled)
+        with pytest.raises(ValueError):
+            count_calls_by_signature(sample=0)
+
+    def test_threads(self):
+        @count_calls_by_signature()
+        def noop(n):
+            pass
+        def call_many(n):
+            for _ in range(1000):
+                noop(n % 2)
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(call_many, range(16)))
+        assert noop.count(0) == noop.count(1) == 8000
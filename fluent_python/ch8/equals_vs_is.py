@@ -1,4 +1,9 @@
+import asyncio
+import io
 import math
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from time import sleep
 
 from utils import average_runtime
@@ -14,31 +19,261 @@ def compare_equals(a, b):
     return a == b
 
 
+class RunningStats:
+    """Mean and variance updated one value at a time (Welford's algorithm)"""
+    def __init__(self):
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0  # sum of squared differences from the mean
+
+    def push(self, x):
+        self.count += 1
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+
+    def extend(self, values):
+        for x in values:
+            self.push(x)
+
+    def pop(self, x):
+        """Removes a value previously pushed"""
+        if self.count <= 1:
+            self.count, self._mean, self._m2 = 0, 0.0, 0.0
+            return
+        delta = x - self._mean
+        self._mean -= delta / (self.count - 1)
+        self._m2 -= delta * (x - self._mean)
+        self.count -= 1
+
+    def mean(self):
+        if not self.count:
+            raise ValueError('mean of no values')
+        return self._mean
+
+    def variance(self):
+        if self.count < 2:
+            raise ValueError('variance needs at least two values')
+        return self._m2 / (self.count - 1)
+
+    def stdev(self):
+        return math.sqrt(self.variance())
+
+
 class BinaryOperationGrid:
+    """Results of a numeric operation on every pair of objects.
+
+    The results are kept row by row in a single array('d') of stride x
+    stride cells, and their mean and standard deviation are updated while
+    the grid is populated. Every object owns a slot, the row and column of
+    the array where its results are stored, so adding or removing an object
+    only touches its own row and column; the stride doubles when there are
+    no free slots left.
+    """
     def __init__(self, operation, objects):
         self.operation = operation
         self.objects = objects
-        self.grid = [[None] * len(objects) for _ in objects]
+        self.symmetric = False
+        self._cells = array('d')
+        self._stride = 0
+        self._slots = []  # slot of each object, in the order of self.objects
+        self._free = []  # slots of removed objects, to be reused
+        self._stats = RunningStats()
+
+    @property
+    def size(self):
+        return len(self._slots)
+
+    def _row(self, slot):
+        stride = self._stride
+        row = self._cells[slot * stride:(slot + 1) * stride]
+        return [row[t] for t in self._slots]
+
+    @property
+    def grid(self):
+        """The results as a list of rows, copied out of the array"""
+        return [self._row(s) for s in self._slots]
+
+    def __getitem__(self, position):
+        i, j = position
+        n = self.size
+        if not (0 <= i < n and 0 <= j < n):
+            raise IndexError(f'{position} is outside of a {n} x {n} grid')
+        return self._cells[self._slots[i] * self._stride + self._slots[j]]
+
+    def populate(self, symmetric=False, workers=None, executor='thread'):
+        """Evaluates the operation on every pair of objects.
+
+        Objects that appear more than once, by identity, are evaluated once.
+        With symmetric=True, operation(y, x) is assumed to equal operation(x, y)
+        and only one of them is evaluated. With workers set, rows are spread
+        over a pool of that many threads, or processes with
+        executor='process', in which case the operation and the objects must
+        be picklable.
+        """
+        self.symmetric = symmetric
+        unique, positions = _unique_by_identity(self.objects)
+        starts = range(len(unique)) if symmetric else [0] * len(unique)
+        if workers is None:
+            rows = [_row(self.operation, unique, i, start) for i, start in enumerate(starts)]
+        elif executor == 'thread':
+            with ThreadPoolExecutor(workers) as pool:
+                rows = list(pool.map(
+                    _row, [self.operation] * len(unique), [unique] * len(unique),
+                    range(len(unique)), starts))
+        elif executor == 'process':
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(self.operation, unique)) as pool:
+                rows = list(pool.map(_worker_row, range(len(unique)), starts))
+        else:
+            raise ValueError(f"executor must be 'thread' or 'process', got {executor!r}")
+        self._store(rows, starts, positions)
+
+    async def populate_async(self, symmetric=False, concurrency=10):
+        """Same as populate, for a coroutine operation.
+
+        `concurrency` worker tasks take the pairs one at a time, so at most
+        that many awaits of the operation are in flight at once.
+        """
+        self.symmetric = symmetric
+        unique, positions = _unique_by_identity(self.objects)
+        starts = range(len(unique)) if symmetric else [0] * len(unique)
+        n = len(unique)
+        rows = [array('d', bytes(8 * (n - start))) for start in starts]
+        # one shared iterator of pairs, so memory does not grow with the number of pairs
+        pairs = ((i, j) for i, start in enumerate(starts) for j in range(start, n))
 
-    def populate(self):
-        for i, x in enumerate(self.objects):
-            for j, y in enumerate(self.objects):
-                self.grid[i][j] = self.operation(x, y)
+        async def worker():
+            for i, j in pairs:
+                rows[i][j - starts[i]] = await self.operation(unique[i], unique[j])
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        self._store(rows, starts, positions)
+
+    def _store(self, rows, starts, positions):
+        # rows[a] holds the results of unique object a against unique objects starts[a] on
+        def value(a, b):
+            if self.symmetric and b < a:
+                a, b = b, a
+            return rows[a][b - starts[a]]
+
+        self._cells = array('d')
+        self._stride = len(positions)
+        self._slots = list(range(len(positions)))
+        self._free = []
+        self._stats = RunningStats()
+        for a in positions:
+            row = [value(a, b) for b in positions]
+            self._cells.extend(row)
+            self._stats.extend(row)
+
+    def _check_populated(self):
+        if self.size != len(self.objects):
+            raise ValueError('The grid is out of date, call populate() first.')
+
+    def _grow(self):
+        # doubles the stride, copying the rows into the top left of a larger array
+        stride, cells = self._stride, self._cells
+        new_stride = max(1, 2 * stride)
+        new_cells = array('d', bytes(8 * new_stride * new_stride))
+        for s in range(stride):
+            new_cells[s * new_stride:s * new_stride + stride] = cells[s * stride:(s + 1) * stride]
+        self._free.extend(range(new_stride - 1, stride - 1, -1))
+        self._stride, self._cells = new_stride, new_cells
+
+    def add(self, obj):
+        """Appends obj to the objects, evaluating only its row and column"""
+        self._check_populated()
+        cells, stride, slots = self._cells, self._stride, self._slots
+        existing = next((i for i, x in enumerate(self.objects) if x is obj), None)
+        if existing is not None:
+            s = slots[existing]
+            row = self._row(s)
+            column = [cells[t * stride + s] for t in slots]
+            row.append(cells[s * stride + s])
+        else:
+            row = [self.operation(obj, y) for y in self.objects]
+            row.append(self.operation(obj, obj))
+            if self.symmetric:
+                column = row[:-1]
+            else:
+                column = [self.operation(x, obj) for x in self.objects]
+
+        if not self._free:
+            self._grow()
+        cells, stride = self._cells, self._stride
+        slot = self._free.pop()
+        for t, x, y in zip(slots, row, column):
+            cells[slot * stride + t] = x
+            cells[t * stride + slot] = y
+        cells[slot * stride + slot] = row[-1]
+        slots.append(slot)
+        self._stats.extend(column)
+        self._stats.extend(row)
+        self.objects.append(obj)
+
+    def remove(self, obj):
+        """Removes the first occurrence of obj, by identity, with its row and column"""
+        self._check_populated()
+        try:
+            k = next(i for i, x in enumerate(self.objects) if x is obj)
+        except StopIteration:
+            raise ValueError(f'{obj!r} is not in the grid') from None
+        cells, stride, slots = self._cells, self._stride, self._slots
+        slot = slots[k]
+        for t in slots:
+            self._stats.pop(cells[slot * stride + t])
+            if t != slot:
+                self._stats.pop(cells[t * stride + slot])
+        del slots[k]
+        self._free.append(slot)
+        del self.objects[k]
 
     def mean(self):
-        return sum(sum(row) for row in self.grid) / len(self.grid) ** 2
+        return self._stats.mean()
 
     def stdev(self):
-        n = len(self.grid) ** 2
-        mean = self.mean() 
-        return math.sqrt(sum(sum((x - mean) ** 2 for x in row) for row in self.grid) / (n - 1))
+        return self._stats.stdev()
 
     def __repr__(self):
         return f'{self.__class__.__name__}(operation={self.operation})'
 
+    def write(self, fp):
+        """Writes the grid to a text file object, one row per line"""
+        for s in self._slots:
+            fp.write(' '.join(f'{x:>25}' for x in self._row(s)) + '\n')
+
     def __str__(self):
-        n = len(self.grid)
-        return '\n'.join(' '.join(['{:>25}'] * n).format(*row) for row in self.grid)
+        buffer = io.StringIO()
+        self.write(buffer)
+        return buffer.getvalue().rstrip('\n')
+
+
+def _unique_by_identity(objects):
+    unique, index_by_id, positions = [], {}, []
+    for obj in objects:
+        if id(obj) not in index_by_id:
+            index_by_id[id(obj)] = len(unique)
+            unique.append(obj)
+        positions.append(index_by_id[id(obj)])
+    return unique, positions
+
+
+def _row(operation, objects, i, start):
+    x = objects[i]
+    return array('d', [operation(x, y) for y in objects[start:]])
+
+
+_worker_state = None
+
+
+def _init_worker(operation, objects):
+    global _worker_state
+    _worker_state = (operation, objects)
+
+
+def _worker_row(i, start):
+    return _row(*_worker_state, i, start)
 
 
 class SlowEquals:
@@ -55,10 +290,10 @@ if __name__ == '__main__':
     objects = [a, b, SlowEquals(2), SlowEquals(3), SlowEquals(3)]
     grid_1 = BinaryOperationGrid(compare_is, objects)
     grid_1.populate()
-    print(str(grid_1))
+    grid_1.write(sys.stdout)
     grid_2 = BinaryOperationGrid(compare_equals, objects)
-    grid_2.populate()
-    print(str(grid_2))
+    grid_2.populate(symmetric=True, workers=len(objects))
+    grid_2.write(sys.stdout)
     print(grid_1.mean())
     print(grid_1.stdev())
     print(grid_2.mean())
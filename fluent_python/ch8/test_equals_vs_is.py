@@ -0,0 +1,270 @@
+import asyncio
+import gc
+import io
+import math
+import operator
+import time
+
+import pytest
+
+from utils import average_runtime
+from .equals_vs_is import BinaryOperationGrid, RunningStats, SlowEquals
+
+
+class CountingEquals:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, a, b):
+        self.calls += 1
+        return a.x == b.x
+
+
+@pytest.fixture
+def objects():
+    a = SlowEquals(1)
+    return [a, a, SlowEquals(2), SlowEquals(3), SlowEquals(3)]
+
+
+@pytest.fixture
+def expected(objects):
+    return [[float(x.x == y.x) for y in objects] for x in objects]
+
+
+def test_populate(objects, expected):
+    grid = BinaryOperationGrid(operator.eq, objects)
+    grid.populate()
+    assert grid.grid == expected
+
+
+def test_duplicate_objects_are_evaluated_once(objects, expected):
+    operation = CountingEquals()
+    grid = BinaryOperationGrid(operation, objects)
+    grid.populate()
+    assert grid.grid == expected
+    assert operation.calls == 4 * 4
+
+
+def test_symmetric_operations_evaluate_half_the_pairs(objects, expected):
+    operation = CountingEquals()
+    grid = BinaryOperationGrid(operation, objects)
+    grid.populate(symmetric=True)
+    assert grid.grid == expected
+    assert operation.calls == 4 * 5 // 2
+
+
+def test_asymmetric_operation():
+    objects = [1, 2, 3]
+    grid = BinaryOperationGrid(operator.sub, objects)
+    grid.populate(workers=2)
+    assert grid.grid == [[0, -1, -2], [1, 0, -1], [2, 1, 0]]
+
+
+@pytest.mark.parametrize('symmetric', [False, True])
+def test_thread_pool(objects, expected, symmetric):
+    grid = BinaryOperationGrid(operator.eq, objects)
+    grid.populate(symmetric=symmetric, workers=4)
+    assert grid.grid == expected
+
+
+def test_process_pool(objects, expected):
+    grid = BinaryOperationGrid(operator.eq, objects)
+    grid.populate(symmetric=True, workers=2, executor='process')
+    assert grid.grid == expected
+
+
+def test_blocking_operations_run_concurrently():
+    objects = [SlowEquals(i) for i in range(8)]
+    start = time.perf_counter()
+    BinaryOperationGrid(operator.eq, objects).populate(workers=8)
+    assert time.perf_counter() - start < 64 * 0.001 / 2
+
+
+def test_timed_operations_in_threads_restore_garbage_collector(objects):
+    assert gc.isenabled()
+    for _ in range(5):
+        BinaryOperationGrid(average_runtime(3)(operator.eq), objects * 4).populate(workers=8)
+    assert gc.isenabled()
+
+
+def test_unknown_executor(objects):
+    with pytest.raises(ValueError):
+        BinaryOperationGrid(operator.eq, objects).populate(workers=2, executor='gpu')
+
+
+class TestStatistics:
+    @pytest.fixture
+    def grid(self):
+        grid = BinaryOperationGrid(operator.sub, [1.5, 2, 4, 8])
+        grid.populate()
+        return grid
+
+    def test_mean_and_stdev_match_two_pass_computation(self, grid):
+        values = [x for row in grid.grid for x in row]
+        mean = sum(values) / len(values)
+        assert grid.mean() == pytest.approx(mean)
+        stdev = math.sqrt(sum((x - mean) ** 2 for x in values) / (len(values) - 1))
+        assert grid.stdev() == pytest.approx(stdev)
+
+    def test_empty_grid(self):
+        grid = BinaryOperationGrid(operator.eq, [])
+        with pytest.raises(ValueError):
+            grid.mean()
+
+    def test_running_stats(self):
+        stats = RunningStats()
+        stats.extend([2, 4, 4, 4, 5, 5, 7, 9])
+        assert stats.count == 8
+        assert stats.mean() == 5
+        assert stats.variance() == pytest.approx(32 / 7)
+
+
+class TestStorage:
+    def test_cells_are_stored_in_an_array(self, objects):
+        grid = BinaryOperationGrid(operator.eq, objects)
+        grid.populate()
+        assert grid._cells.typecode == 'd'
+        assert len(grid._cells) == 25
+        assert grid[0, 1] == 1.0
+        assert grid[0, 2] == 0.0
+        with pytest.raises(IndexError):
+            grid[5, 0]
+
+    def test_write_streams_rows(self):
+        grid = BinaryOperationGrid(operator.sub, [1, 2])
+        grid.populate()
+        buffer = io.StringIO()
+        grid.write(buffer)
+        assert buffer.getvalue() == f'{0.0:>25} {-1.0:>25}\n{1.0:>25} {0.0:>25}\n'
+        assert str(grid) == buffer.getvalue().rstrip('\n')
+
+
+class TestIncrementalUpdates:
+    def test_add_evaluates_only_the_new_row_and_column(self):
+        objects = [1, 2, 4]
+        grid = BinaryOperationGrid(CountingSub(), objects)
+        grid.populate()
+        grid.operation.calls = 0
+        grid.add(8)
+        assert grid.operation.calls == 2 * 3 + 1
+        assert grid.objects == [1, 2, 4, 8]
+        assert_matches_fresh_grid(grid)
+
+    def test_add_symmetric(self, objects):
+        operation = CountingEquals()
+        grid = BinaryOperationGrid(operation, objects)
+        grid.populate(symmetric=True)
+        operation.calls = 0
+        grid.add(SlowEquals(2))
+        assert operation.calls == len(objects)
+        assert_matches_fresh_grid(grid)
+
+    def test_add_duplicate_object(self, objects):
+        operation = CountingEquals()
+        grid = BinaryOperationGrid(operation, objects)
+        grid.populate()
+        operation.calls = 0
+        grid.add(objects[2])
+        assert operation.calls == 0
+        assert_matches_fresh_grid(grid)
+
+    def test_add_to_empty_grid(self):
+        grid = BinaryOperationGrid(operator.sub, [])
+        grid.add(1.0)
+        grid.add(3.0)
+        assert grid.grid == [[0, -2], [2, 0]]
+        assert grid.mean() == 0
+
+    def test_remove(self):
+        grid = BinaryOperationGrid(CountingSub(), [1, 2, 4, 8])
+        grid.populate()
+        grid.operation.calls = 0
+        grid.remove(2)
+        assert grid.operation.calls == 0
+        assert grid.objects == [1, 4, 8]
+        assert_matches_fresh_grid(grid)
+        with pytest.raises(ValueError):
+            grid.remove(2)
+
+    def test_removed_slots_are_reused(self):
+        grid = BinaryOperationGrid(operator.sub, [1, 2, 4, 8])
+        grid.populate()
+        for x in [16, 32, 64]:
+            grid.add(x)
+        assert len(grid._cells) == 8 * 8
+        grid.remove(2)
+        grid.remove(32)
+        grid.add(128)
+        grid.add(256)
+        grid.add(512)
+        assert len(grid._cells) == 8 * 8
+        assert grid.objects == [1, 4, 8, 16, 64, 128, 256, 512]
+        assert grid[1, 5] == 4 - 128
+        assert_matches_fresh_grid(grid)
+
+    def test_out_of_date_grid(self):
+        grid = BinaryOperationGrid(operator.sub, [1, 2])
+        with pytest.raises(ValueError):
+            grid.add(3)
+
+
+class CountingSub:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, a, b):
+        self.calls += 1
+        return a - b
+
+
+def assert_matches_fresh_grid(grid):
+    fresh = BinaryOperationGrid(grid.operation, list(grid.objects))
+    fresh.populate()
+    assert grid.grid == fresh.grid
+    assert grid.mean() == pytest.approx(fresh.mean())
+    assert grid.stdev() == pytest.approx(fresh.stdev())
+
+
+class TestPopulateAsync:
+    @staticmethod
+    async def slow_equals(a, b):
+        await asyncio.sleep(0.001)
+        return a.x == b.x
+
+    @pytest.mark.parametrize('symmetric', [False, True])
+    def test_populate_async(self, objects, expected, symmetric):
+        grid = BinaryOperationGrid(self.slow_equals, objects)
+        asyncio.run(grid.populate_async(symmetric=symmetric))
+        assert grid.grid == expected
+        assert grid.mean() == pytest.approx(sum(map(sum, expected)) / 25)
+
+    def test_concurrency_is_bounded(self):
+        in_flight = peak = 0
+        async def operation(a, b):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return a - b
+        grid = BinaryOperationGrid(operation, list(range(6)))
+        asyncio.run(grid.populate_async(concurrency=4))
+        assert peak == 4
+        assert grid[5, 0] == 5
+
+    def test_tasks_are_not_created_per_pair(self):
+        most_tasks = 0
+        async def operation(a, b):
+            nonlocal most_tasks
+            most_tasks = max(most_tasks, len(asyncio.all_tasks()))
+            await asyncio.sleep(0)
+            return a - b
+        grid = BinaryOperationGrid(operation, list(range(20)))
+        asyncio.run(grid.populate_async(concurrency=3))
+        assert most_tasks <= 3 + 1  # the workers and the main task
+        assert grid[19, 0] == 19
+
+    def test_with_average_runtime(self, objects):
+        grid = BinaryOperationGrid(average_runtime(3)(self.slow_equals), objects)
+        asyncio.run(grid.populate_async(symmetric=True))
+        assert min(map(min, grid.grid)) >= 0.001
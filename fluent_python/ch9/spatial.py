@@ -0,0 +1,178 @@
+import heapq
+import math
+from itertools import chain
+
+
+class GridIndex:
+    """Uniform grid over Vector2d points for nearest-neighbor and range queries.
+
+    Points are bucketed into square cells of side cell_size, so a query only
+    measures the points of the cells around its center. Without an explicit
+    cell_size, the first batch of points picks one that puts about two
+    points in each cell of its bounding box.
+    """
+    def __init__(self, points=(), cell_size=None):
+        points = list(points)
+        if cell_size is None:
+            cell_size = _default_cell_size(points)
+        if not cell_size > 0:
+            raise ValueError(f'cell_size must be positive, got {cell_size}.')
+        self.cell_size = float(cell_size)
+        self._cells = {}  # (column, row) -> list of points
+        self._len = 0
+        self._bounds = None  # (left, bottom, right, top) keys covering every occupied cell
+        self.extend(points)
+
+    def _key(self, x, y):
+        size = self.cell_size
+        return math.floor(x / size), math.floor(y / size)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._cells.values())
+
+    def __contains__(self, point):
+        return point in self._cells.get(self._key(point.x, point.y), ())
+
+    def _grow_bounds(self, column, row):
+        if self._bounds is None:
+            self._bounds = (column, row, column, row)
+        else:
+            left, bottom, right, top = self._bounds
+            self._bounds = (min(left, column), min(bottom, row), max(right, column), max(top, row))
+
+    def insert(self, point) -> None:
+        key = self._key(point.x, point.y)
+        try:
+            self._cells[key].append(point)
+        except KeyError:
+            self._cells[key] = [point]
+            self._grow_bounds(*key)
+        self._len += 1
+
+    def extend(self, points) -> None:
+        cells, size, floor = self._cells, self.cell_size, math.floor
+        n = 0
+        for point in points:
+            key = floor(point.x / size), floor(point.y / size)
+            try:
+                cells[key].append(point)
+            except KeyError:
+                cells[key] = [point]
+                self._grow_bounds(*key)
+            n += 1
+        self._len += n
+
+    def remove(self, point) -> None:
+        """Removes one point equal to point, raises ValueError if there is none"""
+        key = self._key(point.x, point.y)
+        cell = self._cells.get(key)
+        if cell is None or point not in cell:
+            raise ValueError(f'{point!r} is not in the index.')
+        cell.remove(point)
+        if not cell:
+            del self._cells[key]
+            if not self._cells:
+                self._bounds = None
+            # otherwise the bounds may now be wider than needed, which is safe
+        self._len -= 1
+
+    def within(self, center, radius: float) -> list:
+        """Points at a distance of at most radius from center"""
+        x, y = center.x, center.y
+        (left, bottom), (right, top) = self._key(x - radius, y - radius), self._key(x + radius, y + radius)
+        if (right - left + 1) * (top - bottom + 1) > len(self._cells):
+            cells = (cell for ((column, row), cell) in self._cells.items()
+                     if left <= column <= right and bottom <= row <= top)
+        else:
+            cells = filter(None, (self._cells.get((column, row))
+                                  for column in range(left, right + 1)
+                                  for row in range(bottom, top + 1)))
+        hypot = math.hypot
+        return [p for cell in cells for p in cell if hypot(p.x - x, p.y - y) <= radius]
+
+    def nearest(self, center, k: int = 1) -> list:
+        """The k points closest to center, closest first"""
+        if k < 1 or not self._len:
+            return []
+        x, y = center.x, center.y
+        column, row = self._key(x, y)
+        cells, hypot = self._cells, math.hypot
+        size = self.cell_size
+        left, bottom, right, top = bounds = self._bounds
+        width, height = right - left + 1, top - bottom + 1
+        # distances from center to the occupied cells along each axis
+        dx = max(left * size - x, x - (right + 1) * size, 0.0)
+        dy = max(bottom * size - y, y - (top + 1) * size, 0.0)
+        best = []  # max-heap of (-distance, tiebreak, point) holding the k closest so far
+        seen = 0
+        # the rings closer to center than the occupied cells are empty
+        ring = max(left - column, column - right, bottom - row, row - top, 0)
+        while seen < self._len:
+            if 2 * (min(2 * ring + 1, width) + min(2 * ring + 1, height)) > len(cells):
+                # rings now cover more cells than the grid has occupied
+                return self._scan(x, y, k)
+            for key in _ring(column, row, ring, bounds):
+                for point in cells.get(key, ()):
+                    seen += 1
+                    entry = (-hypot(point.x - x, point.y - y), seen, point)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry[0] > best[0][0]:
+                        heapq.heapreplace(best, entry)
+            # a point in a cell beyond this ring is further than ring * cell_size
+            # along one axis, and at least dx and dy away along each of them
+            reach = ring * size
+            if len(best) == k and -best[0][0] <= min(hypot(max(reach, dx), dy), hypot(dx, max(reach, dy))):
+                break
+            ring += 1
+        return [point for (_, _, point) in sorted(best, reverse=True)]
+
+    def _scan(self, x, y, k):
+        hypot = math.hypot
+        return heapq.nsmallest(k, self, key=lambda p: hypot(p.x - x, p.y - y))
+
+
+def _ring(column, row, ring, bounds):
+    """Keys of the cells at Chebyshev distance ring from (column, row),
+    within the (left, bottom, right, top) bounds"""
+    left, bottom, right, top = bounds
+    if ring == 0:
+        if left <= column <= right and bottom <= row <= top:
+            yield column, row
+        return
+    columns = range(max(column - ring, left), min(column + ring, right) + 1)
+    for r in (row - ring, row + ring):
+        if bottom <= r <= top:
+            for c in columns:
+                yield c, r
+    rows = range(max(row - ring + 1, bottom), min(row + ring - 1, top) + 1)
+    for c in (column - ring, column + ring):
+        if left <= c <= right:
+            for r in rows:
+                yield c, r
+
+
+def _default_cell_size(points, per_cell=2):
+    if not points:
+        return 1.0
+    xs = [p.x for p in points]
+    ys = [p.y for p in points]
+    width, height = max(xs) - min(xs), max(ys) - min(ys)
+    if width and height:
+        return math.sqrt(width * height * per_cell / len(points))
+    return max(width, height) * per_cell / len(points) or 1.0
+
+
+def linear_nearest(points, center, k: int = 1) -> list:
+    """Brute-force counterpart of GridIndex.nearest"""
+    x, y, hypot = center.x, center.y, math.hypot
+    return heapq.nsmallest(k, points, key=lambda p: hypot(p.x - x, p.y - y))
+
+
+def linear_within(points, center, radius: float) -> list:
+    """Brute-force counterpart of GridIndex.within"""
+    x, y, hypot = center.x, center.y, math.hypot
+    return [p for p in points if hypot(p.x - x, p.y - y) <= radius]
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from .spatial import GridIndex, linear_nearest, linear_within
+from .vector2d import Vector2d, ShortVector2d
+
+
+class TestGridIndex:
+    @pytest.fixture
+    def points(self):
+        rng = random.Random(42)
+        return [Vector2d(rng.uniform(-100, 100), rng.gauss(0, 20)) for _ in range(2000)]
+
+    @pytest.fixture
+    def centers(self):
+        rng = random.Random(7)
+        return [Vector2d(rng.uniform(-150, 150), rng.uniform(-150, 150)) for _ in range(50)]
+
+    def test_bulk_build(self, points):
+        index = GridIndex(points)
+        assert len(index) == len(points)
+        assert sorted(index, key=tuple) == sorted(points, key=tuple)
+        assert points[0] in index
+        assert Vector2d(1000, 1000) not in index
+
+    def test_nearest_matches_linear_scan(self, points, centers):
+        index = GridIndex(points)
+        for center in centers:
+            for k in (1, 5):
+                expected = linear_nearest(points, center, k)
+                assert [abs(Vector2d(p.x - center.x, p.y - center.y)) for p in index.nearest(center, k)] \
+                    == [abs(Vector2d(p.x - center.x, p.y - center.y)) for p in expected]
+
+    def test_nearest_far_from_every_point(self, points):
+        index = GridIndex(points)
+        center = Vector2d(1e6, -1e6)
+        assert index.nearest(center, 3) == linear_nearest(points, center, 3)
+
+    @pytest.mark.parametrize('center', [
+        Vector2d(5000, 0), Vector2d(0, -5000), Vector2d(-3000, 3000), Vector2d(101, 200)])
+    def test_nearest_outside_the_occupied_cells(self, points, center):
+        index = GridIndex(points)
+        assert index.nearest(center, 5) == linear_nearest(points, center, 5)
+
+    def test_within_matches_linear_scan(self, points, centers):
+        index = GridIndex(points)
+        for center in centers:
+            for radius in (0.5, 10, 500):
+                assert sorted(index.within(center, radius), key=tuple) \
+                    == sorted(linear_within(points, center, radius), key=tuple)
+
+    def test_insert_and_remove(self):
+        index = GridIndex(cell_size=1)
+        assert index.nearest(Vector2d(0, 0)) == []
+        index.insert(Vector2d(0.5, 0.5))
+        index.insert(Vector2d(3, 4))
+        assert index.nearest(Vector2d(3, 3)) == [Vector2d(3, 4)]
+        assert index.nearest(Vector2d(3, 3), k=5) == [Vector2d(3, 4), Vector2d(0.5, 0.5)]
+        index.remove(Vector2d(3, 4))
+        assert len(index) == 1
+        assert index.nearest(Vector2d(2, 2)) == [Vector2d(0.5, 0.5)]
+        with pytest.raises(ValueError):
+            index.remove(Vector2d(3, 4))
+        assert index.nearest(Vector2d(2, 2), k=0) == []
+        index.remove(Vector2d(0.5, 0.5))
+        assert index.nearest(Vector2d(2, 2)) == []
+        index.insert(Vector2d(-7, 2))
+        assert index.nearest(Vector2d(100, 100)) == [Vector2d(-7, 2)]
+
+    def test_short_vectors(self):
+        points = [ShortVector2d(i / 3, i / 7) for i in range(100)]
+        index = GridIndex(points)
+        assert index.nearest(ShortVector2d(0, 0)) == [points[0]]
+        assert len(index.within(ShortVector2d(0, 0), 1)) == len(linear_within(points, ShortVector2d(0, 0), 1))
+
+    def test_invalid_cell_size(self):
+        with pytest.raises(ValueError):
+            GridIndex(cell_size=0)
@@ -1,4 +1,8 @@
+import copy
+import gc
 import math
+import pickle
+import weakref
 import pytest
 
 from .vector2d import Vector2d, ShortVector2d
@@ -38,6 +42,47 @@ class TestVector2d:
         v2 = Vector2d.frombytes(octets)
         assert v2 == vec_1
 
+    def test_hash_is_order_sensitive(self):
+        assert hash(Vector2d(1, 2)) != hash(Vector2d(2, 1))
+        assert hash(Vector2d(1, 1)) != hash(Vector2d(2, 2))
+        assert hash(Vector2d(1, 2)) == hash(Vector2d(1.0, 2.0))
+
+    def test_intern(self):
+        v = Vector2d.intern(3, 4)
+        assert Vector2d.intern(3.0, 4.0) is v
+        assert Vector2d.intern(4, 3) is not v
+        assert v == Vector2d(3, 4)
+
+    def test_intern_keeps_the_sign_of_zero(self):
+        v = Vector2d.intern(0.0, -0.0)
+        assert Vector2d.intern(0, -0.0) is v
+        for x, y in [(0.0, 0.0), (-0.0, -0.0), (-0.0, 0.0)]:
+            w = Vector2d.intern(x, y)
+            assert w is not v
+            assert (math.copysign(1, w.x), math.copysign(1, w.y)) == (math.copysign(1, x), math.copysign(1, y))
+
+    def test_interned_instances_are_weakly_held(self):
+        ref = weakref.ref(Vector2d.intern(7, 8))
+        gc.collect()
+        assert ref() is None
+        v = Vector2d.intern(7, 8)
+        assert Vector2d.intern(7, 8) is v
+
+    def test_copy(self, vec_1):
+        assert copy.copy(vec_1) is vec_1
+        assert copy.deepcopy(vec_1) is vec_1
+
+    def test_pickle(self, vec_1):
+        for v in (vec_1, ShortVector2d(1, 2)):
+            w = pickle.loads(pickle.dumps(v))
+            assert type(w) is type(v)
+            assert w == v
+
+    def test_identity_fast_path(self):
+        nan = Vector2d(float('nan'), 0)
+        assert nan == nan
+        assert nan != Vector2d(float('nan'), 0)
+
 
 class TestShortVector2d:
     @pytest.fixture
@@ -47,3 +92,13 @@ class TestShortVector2d:
     def test_bytes(self, short_vec_1):
         assert len(bytes(short_vec_1)) == 9
 
+    def test_bytes_overflow_to_infinity(self):
+        v = ShortVector2d.frombytes(bytes(ShortVector2d(1e300, -1e300)))
+        assert (v.x, v.y) == (math.inf, -math.inf)
+
+    def test_intern_per_class(self):
+        short = ShortVector2d.intern(1, 2)
+        assert type(short) is ShortVector2d
+        assert ShortVector2d.intern(1, 2) is short
+        assert Vector2d.intern(1, 2) is not short
+
@@ -0,0 +1,68 @@
+from array import array
+
+import pytest
+
+from .vector2d import Vector2d, ShortVector2d
+from .vector2d_array import Vector2dArray, ShortVector2dArray
+
+
+class TestVector2dArray:
+    @pytest.fixture
+    def vectors(self):
+        return Vector2dArray([Vector2d(3, 4), Vector2d(5, 12), Vector2d(0, 0)])
+
+    def test_columns(self, vectors):
+        assert vectors.xs == array('d', [3, 5, 0])
+        assert vectors.ys == array('d', [4, 12, 0])
+        assert len(vectors) == 3
+
+    def test_fromcolumns(self):
+        assert list(Vector2dArray.fromcolumns([1, 2], [3, 4])) == [Vector2d(1, 3), Vector2d(2, 4)]
+        with pytest.raises(ValueError):
+            Vector2dArray.fromcolumns([1, 2], [3])
+
+    def test_getitem(self, vectors):
+        assert vectors[1] == Vector2d(5, 12)
+        assert vectors[-1] == Vector2d(0, 0)
+        assert isinstance(vectors[0], Vector2d)
+        assert list(vectors[1:]) == [Vector2d(5, 12), Vector2d(0, 0)]
+        with pytest.raises(IndexError):
+            vectors[3]
+        with pytest.raises(TypeError):
+            vectors['x']
+
+    def test_abs(self, vectors):
+        assert abs(vectors) == array('d', [abs(v) for v in vectors]) == array('d', [5, 13, 0])
+
+    def test_add(self, vectors):
+        total = vectors + vectors
+        assert list(total) == [Vector2d(6, 8), Vector2d(10, 24), Vector2d(0, 0)]
+        assert list(vectors + Vector2d(1, 1)) == [Vector2d(4, 5), Vector2d(6, 13), Vector2d(1, 1)]
+        with pytest.raises(ValueError):
+            vectors + vectors[1:]
+        with pytest.raises(TypeError):
+            vectors + 1
+
+    def test_scale(self, vectors):
+        assert list(2 * vectors) == list(vectors * 2) == [
+            Vector2d(6, 8), Vector2d(10, 24), Vector2d(0, 0)]
+        with pytest.raises(TypeError):
+            vectors * vectors
+
+    def test_equal(self, vectors):
+        other = Vector2dArray([Vector2d(3, 4), Vector2d(12, 5), Vector2d(0, 0)])
+        assert list(vectors.equal(other)) == [1, 0, 1]
+        assert list(vectors.equal(Vector2d(0, 0))) == [0, 0, 1]
+
+    def test_hashes(self, vectors):
+        assert vectors.hashes() == [hash(v) for v in vectors]
+
+
+class TestShortVector2dArray:
+    def test_uses_short_vectors(self):
+        v = ShortVector2d(1 / 11, 1 / 27)
+        vectors = ShortVector2dArray([v])
+        assert isinstance(vectors[0], ShortVector2d)
+        assert vectors[0] == v
+        assert list(vectors.equal(v)) == [1]
+        assert vectors.hashes() == [hash(v)]
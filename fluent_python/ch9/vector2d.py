@@ -1,9 +1,21 @@
-from array import array
 import math
+import struct
+from array import array
+from weakref import WeakValueDictionary
+
+
+def _hash_components(x, y):
+    return hash((x, y))
 
 
 class Vector2d:
+    __slots__ = ('__x', '__y', '__weakref__')
     typecode = 'd'  # needed to convert to/from bytes
+    _interned = WeakValueDictionary()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._interned = WeakValueDictionary()
 
     def __init__(self, x, y):
         self.__x = float(x)
@@ -24,16 +36,17 @@ class Vector2d:
         return f'<{self.x}, {self.y}>'
 
     def __hash__(self):
-        return hash(self.x) ^ hash(self.y)
+        return _hash_components(self.__x, self.__y)
 
     def __iter__(self):
         return (element for element in (self.x, self.y))
     
     def __bytes__(self):
-        return (bytes([ord(self.typecode)]) +
-            bytes(array(self.typecode, self)))
+        return self.typecode.encode() + array(self.typecode, (self.__x, self.__y)).tobytes()
 
     def __eq__(self, other: 'Vector2d'):
+        if self is other:
+            return True
         return self.x == other.x and self.y == other.y
 
     def __abs__(self):
@@ -42,12 +55,36 @@ class Vector2d:
     def __bool__(self):
         return abs(self) > 0
 
+    def __copy__(self):
+        # immutable, so like a tuple a copy is the instance itself
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return type(self), (self.__x, self.__y)
+
+    @classmethod
+    def intern(cls, x, y):
+        """The one live instance of cls with these coordinates.
+
+        The signs are part of the key, so 0.0 and -0.0 are interned apart.
+        """
+        x, y = float(x), float(y)
+        key = (x, y, math.copysign(1.0, x), math.copysign(1.0, y))
+        try:
+            return cls._interned[key]
+        except KeyError:
+            v = cls._interned[key] = cls(x, y)
+            return v
+
     @classmethod
     def frombytes(cls, octets):
         typecode = chr(octets[0])
-        memv = memoryview(octets[1:]).cast(typecode)
-        return cls(*memv)
+        return cls(*struct.unpack_from(f'=2{typecode}', octets, 1))
 
 
 class ShortVector2d(Vector2d):
-    typecode = 'f'
\ No newline at end of file
+    __slots__ = ()
+    typecode = 'f'
@@ -0,0 +1,111 @@
+import math
+import numbers
+import operator
+from array import array
+from typing import Iterable, Union
+
+from .vector2d import Vector2d, ShortVector2d
+
+
+class Vector2dArray:
+    """Columnar collection of Vector2d, with all x and all y values in two arrays"""
+    vector_class = Vector2d
+
+    def __init__(self, vectors: Iterable[Vector2d] = ()):
+        # double precision for every vector_class: ShortVector2d also keeps float
+        # coordinates, its typecode only sets the format of bytes()
+        self._xs = array('d')
+        self._ys = array('d')
+        for v in vectors:
+            self.append(v)
+
+    @classmethod
+    def fromcolumns(cls, xs: Iterable, ys: Iterable):
+        vectors = cls()
+        vectors._xs.extend(xs)
+        vectors._ys.extend(ys)
+        if len(vectors._xs) != len(vectors._ys):
+            raise ValueError('x and y columns must have the same length.')
+        return vectors
+
+    @property
+    def xs(self):
+        return self._xs
+
+    @property
+    def ys(self):
+        return self._ys
+
+    def append(self, v: Vector2d):
+        self._xs.append(v.x)
+        self._ys.append(v.y)
+
+    def __len__(self):
+        return len(self._xs)
+
+    def __iter__(self):
+        cls = self.vector_class
+        return (cls(x, y) for (x, y) in zip(self._xs, self._ys))
+
+    def __getitem__(self, index: Union[numbers.Integral, slice]):
+        if isinstance(index, numbers.Integral):
+            return self.vector_class(self._xs[index], self._ys[index])
+        elif isinstance(index, slice):
+            return self.fromcolumns(self._xs[index], self._ys[index])
+        else:
+            raise TypeError(f'Invalid input to __getitem__ {index} of type {type(index)}.')
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}([' + ', '.join(repr(v) for v in self) + '])'
+
+    def __abs__(self):
+        """Norm of every vector, as an array('d')"""
+        return array('d', [math.sqrt(x * x + y * y) for (x, y) in zip(self._xs, self._ys)])
+
+    def _columns_of(self, other):
+        if isinstance(other, Vector2dArray):
+            if len(other) != len(self):
+                raise ValueError(f'Length mismatch: {len(self)} and {len(other)}.')
+            return other._xs, other._ys
+        elif isinstance(other, Vector2d):
+            return [other.x] * len(self), [other.y] * len(self)
+        return None
+
+    def __add__(self, other):
+        columns = self._columns_of(other)
+        if columns is None:
+            return NotImplemented
+        xs, ys = columns
+        return self.fromcolumns(map(operator.add, self._xs, xs),
+                                map(operator.add, self._ys, ys))
+
+    def __radd__(self, other):
+        return self + other
+
+    def __mul__(self, scalar):
+        if not isinstance(scalar, numbers.Real):
+            return NotImplemented
+        return self.fromcolumns([x * scalar for x in self._xs],
+                                [y * scalar for y in self._ys])
+
+    def __rmul__(self, scalar):
+        return self * scalar
+
+    def equal(self, other) -> array:
+        """Mask with 1 where the vectors in self and other are equal, 0 elsewhere"""
+        columns = self._columns_of(other)
+        if columns is None:
+            raise TypeError(f'Cannot compare {type(self).__name__} with {type(other).__name__}.')
+        xs, ys = columns
+        return array('B', map(operator.and_,
+                              map(operator.eq, self._xs, xs),
+                              map(operator.eq, self._ys, ys)))
+
+    def hashes(self):
+        """hash() of every vector, without creating Vector2d instances"""
+        # same as _hash_components, without a Python call per vector
+        return list(map(hash, zip(self._xs, self._ys)))
+
+
+class ShortVector2dArray(Vector2dArray):
+    vector_class = ShortVector2d
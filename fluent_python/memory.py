@@ -0,0 +1,55 @@
+"""Per-instance memory footprint, measured with tracemalloc.
+
+Run from the fluent_python directory with `python -m memory [n_instances]`.
+"""
+import sys
+import tracemalloc
+
+
+def instance_footprint(factory, n=10_000):
+    """Average bytes allocated per object for n objects created by factory(i)"""
+    instances = [None] * n  # the list itself is not part of the footprint
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for i in range(n):
+            instances[i] = factory(i)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return (after - before) / n
+
+
+def memory_report(factories, n=10_000):
+    """Name -> average bytes per instance, for a dict of name -> factory(i)"""
+    return {name: instance_footprint(factory, n) for name, factory in factories.items()}
+
+
+def format_report(report, n):
+    lines = [f'{"class":<24}{"bytes/instance":>16}{f"total for {n:,}":>24}']
+    for name, size in report.items():
+        lines.append(f'{name:<24}{size:>16.1f}{size * n / 2 ** 20:>20.1f} MiB')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    from ch9.vector2d import Vector2d, ShortVector2d
+    from ch10.vector import Vector as Vector10
+    from ch13.vector import Vector as Vector13
+
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 100_000
+    factories = {
+        'ch9.Vector2d': lambda i: Vector2d(i, i + 1),
+        'ch9.ShortVector2d': lambda i: ShortVector2d(i, i + 1),
+        'ch10.Vector (3d)': lambda i: Vector10([i, i + 1, i + 2]),
+        'ch13.Vector (3d)': lambda i: Vector13([i, i + 1, i + 2]),
+    }
+    print(format_report(memory_report(factories, n), n))
+
+
+if __name__ == '__main__':
+    main()
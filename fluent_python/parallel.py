@@ -0,0 +1,141 @@
+"""Chunked parallel reductions over the components of ch10 and ch13 Vectors.
+
+Vectors shorter than the threshold are reduced serially. Longer ones are
+split into one chunk per worker. With the 'process' backend the components
+are copied once into shared memory that every worker process attaches to;
+with the 'thread' backend, which needs NumPy, the workers run NumPy
+reductions that release the GIL over views of the vector's own array.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
+from multiprocessing.shared_memory import SharedMemory
+from operator import mul
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only the thread backend needs it
+    np = None
+
+
+PARALLEL_THRESHOLD = 1_000_000
+HASH_BLOCK = 1024  # same as ch10.vector.HASH_BLOCK and ch13.vector.HASH_BLOCK
+
+
+# chunk reductions, shared by both backends and the serial fallback
+def _sum_of_squares(values):
+    if np is not None and isinstance(values, np.ndarray):
+        return float(np.dot(values, values))
+    return sum(map(mul, values, values))
+
+
+def _dot(values, others):
+    if np is not None and isinstance(values, np.ndarray):
+        return float(np.dot(values, others))
+    return sum(map(mul, values, others))
+
+
+def _equal(values, others):
+    if np is not None and isinstance(values, np.ndarray):
+        return bool(np.array_equal(values, others))
+    return values == others
+
+
+def _block_hashes(values):
+    return [hash(tuple(values[i:i + HASH_BLOCK])) for i in range(0, len(values), HASH_BLOCK)]
+
+
+def _process_chunk(reduction, blocks, start, stop):
+    attached = [SharedMemory(name=name) for (name, _) in blocks]
+    views = []
+    try:
+        for shm, (_, typecode) in zip(attached, blocks):
+            memv = shm.buf.cast(typecode)
+            views.append(memv)
+            views.append(memv[start:stop])
+        return reduction(*views[1::2])
+    finally:
+        for memv in reversed(views):
+            memv.release()
+        for shm in attached:
+            shm.close()
+
+
+def _chunk_bounds(n, workers, align=1):
+    step = -(-n // (workers * align)) * align
+    return [(start, min(start + step, n)) for start in range(0, n, step)]
+
+
+def _resolve_backend(backend):
+    if backend == 'auto':
+        return 'thread' if np is not None else 'process'
+    if backend == 'thread' and np is None:
+        raise RuntimeError("The 'thread' backend needs NumPy.")
+    if backend not in ('thread', 'process'):
+        raise ValueError(f'Unknown backend {backend!r}.')
+    return backend
+
+
+def _map_chunks(reduction, vectors, n, workers, backend, align=1):
+    workers = workers or os.cpu_count() or 1
+    bounds = _chunk_bounds(n, workers, align)
+    if _resolve_backend(backend) == 'thread':
+        arrays = [np.frombuffer(v._components, dtype=v.typecode)[:n].astype('d', copy=False)
+                  for v in vectors]
+        with ThreadPoolExecutor(workers) as pool:
+            futures = [pool.submit(reduction, *(a[start:stop] for a in arrays))
+                       for (start, stop) in bounds]
+            return [f.result() for f in futures]
+
+    blocks, segments = [], []
+    try:
+        for v in vectors:
+            memv = memoryview(v._components).cast('B')[:n * v._components.itemsize]
+            shm = SharedMemory(create=True, size=max(memv.nbytes, 1))
+            segments.append(shm)
+            shm.buf[:memv.nbytes] = memv
+            blocks.append((shm.name, v.typecode))
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_process_chunk, reduction, blocks, start, stop)
+                       for (start, stop) in bounds]
+            return [f.result() for f in futures]
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+
+def parallel_norm(vector, workers=None, threshold=PARALLEL_THRESHOLD, backend='auto'):
+    """Same as abs(vector)"""
+    n = len(vector)
+    if n < threshold or n == 0:
+        return abs(vector)
+    return math.sqrt(sum(_map_chunks(_sum_of_squares, [vector], n, workers, backend)))
+
+
+def parallel_dot(v, w, workers=None, threshold=PARALLEL_THRESHOLD, backend='auto'):
+    """Dot product over the components v and w have in common"""
+    n = min(len(v), len(w))
+    if n < threshold or n == 0:
+        return _dot(v._components[:n], w._components[:n])
+    return sum(_map_chunks(_dot, [v, w], n, workers, backend))
+
+
+def parallel_eq(v, w, workers=None, threshold=PARALLEL_THRESHOLD, backend='auto'):
+    """Same as v == w"""
+    n = len(v)
+    if n != len(w):
+        return False
+    if n < threshold or n == 0:
+        return v == w
+    return all(_map_chunks(_equal, [v, w], n, workers, backend))
+
+
+def parallel_hash(vector, workers=None, threshold=PARALLEL_THRESHOLD):
+    """Same as hash(vector); hashing boxes every component, so it always uses processes"""
+    n = len(vector)
+    if n < threshold or n <= HASH_BLOCK:
+        return hash(vector)
+    chunks = _map_chunks(_block_hashes, [vector], n, workers, 'process', align=HASH_BLOCK)
+    return hash(tuple(chain.from_iterable(chunks)))
@@ -0,0 +1,196 @@
+"""Always-on latency profiling with fixed-memory histograms.
+
+Each profiled function records the wall-clock latency of every call, in
+nanoseconds, into a log-linear (HDR-style) histogram: values below 64 ns
+get a bucket each, above that every power of two is split into 32 buckets,
+so any recorded value is known to within about 3%. A histogram is a single
+array of 1184 counters, whatever the number of calls.
+
+The profiled call only appends its raw latency to a list of at most
+PENDING_LIMIT values, which are bucketed in one batch when it fills up or
+when the histogram is read, so the arithmetic stays off the hot path.
+"""
+import functools
+import json
+import threading
+from array import array
+from collections import Counter
+from time import perf_counter_ns
+
+from benchmark import Benchmark
+
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 2 ** SUB_BUCKET_BITS
+_LINEAR_LIMIT = 2 * SUB_BUCKETS
+MAX_SHIFT = 35  # latencies above about 2**41 ns (36 minutes) share the last bucket
+N_BUCKETS = _LINEAR_LIMIT + MAX_SHIFT * SUB_BUCKETS
+PENDING_LIMIT = 4096  # raw latencies buffered before they are bucketed
+
+
+def bucket_index(ns: int) -> int:
+    # a value with `shift` bits below its top SUB_BUCKET_BITS + 1 bits lands in
+    # bucket _LINEAR_LIMIT + (shift - 1) * SUB_BUCKETS + (ns >> shift) - SUB_BUCKETS,
+    # which simplifies to (shift << SUB_BUCKET_BITS) + (ns >> shift)
+    shift = ns.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return ns
+    elif shift <= MAX_SHIFT:
+        return (shift << SUB_BUCKET_BITS) + (ns >> shift)
+    return N_BUCKETS - 1
+
+
+def bucket_value(index: int) -> int:
+    """Highest latency, in ns, that falls into the bucket"""
+    if index < _LINEAR_LIMIT:
+        return index
+    shift, offset = divmod(index - _LINEAR_LIMIT, SUB_BUCKETS)
+    shift += 1
+    return ((SUB_BUCKETS + offset + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * N_BUCKETS))
+        self._total_ns = self._max_ns = 0
+        self._pending = []  # latencies recorded since the last flush
+        self._lock = threading.Lock()
+
+    @property
+    def count(self):
+        self.flush()
+        return sum(self.counts)
+
+    @property
+    def total_ns(self):
+        self.flush()
+        return self._total_ns
+
+    @property
+    def max_ns(self):
+        self.flush()
+        return self._max_ns
+
+    def record(self, ns: int) -> None:
+        self._pending.append(ns)
+        if len(self._pending) >= PENDING_LIMIT:
+            self.flush()
+
+    def flush(self) -> None:
+        """Buckets the latencies recorded since the last flush"""
+        with self._lock:
+            pending = self._pending
+            n = len(pending)
+            if not n:
+                return
+            # values appended by other threads meanwhile stay for the next flush
+            batch = pending[:n]
+            del pending[:n]
+            counts = self.counts
+            for ns, k in Counter(batch).items():
+                counts[bucket_index(ns)] += k
+            self._total_ns += sum(batch)
+            self._max_ns = max(self._max_ns, max(batch))
+
+    def percentile(self, p: float) -> int:
+        """Latency in ns below which p percent of the calls fall"""
+        if not 0 <= p <= 100:
+            raise ValueError(f'Percentile must be between 0 and 100, got {p}.')
+        count = self.count
+        if not count:
+            return 0
+        rank = max(1, -(-count * p // 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bucket_value(index), self.max_ns)
+        return self.max_ns
+
+    def to_dict(self):
+        count = self.count
+        return {
+            'count': count,
+            'mean_ns': self.total_ns / count if count else 0.0,
+            'p50_ns': self.percentile(50),
+            'p99_ns': self.percentile(99),
+            'max_ns': self.max_ns,
+        }
+
+
+class Registry:
+    """Latency histograms of profiled functions, by name"""
+    def __init__(self):
+        self.histograms = {}
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        if name not in self.histograms:
+            self.histograms[name] = LatencyHistogram()
+        return self.histograms[name]
+
+    def snapshot(self):
+        return {name: h.to_dict() for name, h in self.histograms.items()}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        lines = [
+            '# HELP function_latency_seconds Wall-clock latency of profiled functions.',
+            '# TYPE function_latency_seconds summary',
+        ]
+        for name, h in self.histograms.items():
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            for quantile in (50, 99):
+                lines.append(f'function_latency_seconds{{function="{label}",quantile="{quantile / 100}"}} '
+                             f'{h.percentile(quantile) / 1e9:.9f}')
+            lines.append(f'function_latency_seconds_sum{{function="{label}"}} {h.total_ns / 1e9:.9f}')
+            lines.append(f'function_latency_seconds_count{{function="{label}"}} {h.count}')
+        lines.append('# HELP function_latency_max_seconds Slowest call of profiled functions.')
+        lines.append('# TYPE function_latency_max_seconds gauge')
+        for name, h in self.histograms.items():
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'function_latency_max_seconds{{function="{label}"}} {h.max_ns / 1e9:.9f}')
+        return '\n'.join(lines) + '\n'
+
+    def dump_json(self, path):
+        with open(path, 'w') as fp:
+            fp.write(self.to_json())
+
+    def dump_prometheus(self, path):
+        with open(path, 'w') as fp:
+            fp.write(self.to_prometheus())
+
+
+registry = Registry()
+
+
+def profile(registry=registry, name=None):
+    """Decorator that records the latency of every call in a registry"""
+    def decorator(f):
+        histogram = registry.histogram(name or f.__qualname__)
+        # histogram.record inlined into closure locals, this is the hot path
+        pending, flush, clock, limit = histogram._pending, histogram.flush, perf_counter_ns, PENDING_LIMIT
+        append = pending.append
+
+        @functools.wraps(f)
+        def call(*args, **kwargs):
+            start = clock()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                append(clock() - start)
+                if len(pending) >= limit:
+                    flush()
+        return call
+    return decorator
+
+
+def measure_overhead(trials=5, loops=100_000):
+    """Seconds added to each call by the profile decorator"""
+    def noop():
+        pass
+    profiled = profile(Registry())(noop)
+    plain = Benchmark(noop, trials=trials, loops=loops).run()
+    instrumented = Benchmark(profiled, trials=trials, loops=loops).run()
+    return max(instrumented.median - plain.median, 0.0)
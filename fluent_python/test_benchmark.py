@@ -0,0 +1,140 @@
+import asyncio
+import gc
+import inspect
+import json
+
+import pytest
+
+from benchmark import (
+    Benchmark, BenchmarkResult, benchmark, compare, gc_suspended, load_results, save_results)
+from utils import average_runtime
+
+
+class TestBenchmarkResult:
+    @pytest.fixture
+    def result(self):
+        return BenchmarkResult('f', [4.0, 1.0, 3.0, 2.0, 5.0], loops=10)
+
+    def test_statistics(self, result):
+        assert result.mean == 3.0
+        assert result.median == 3.0
+        assert result.min == 1.0
+        assert result.max == 5.0
+        assert result.stdev == pytest.approx(1.5811, rel=1e-4)
+
+    def test_percentile(self, result):
+        assert result.percentile(0) == 1.0
+        assert result.percentile(50) == 3.0
+        assert result.percentile(100) == 5.0
+        assert result.percentile(25) == 2.0
+        assert result.percentile(90) == pytest.approx(4.6)
+        with pytest.raises(ValueError):
+            result.percentile(101)
+
+    def test_single_sample_has_zero_stdev(self):
+        assert BenchmarkResult('f', [1.0], loops=1).stdev == 0.0
+
+
+class TestBenchmark:
+    def test_run_collects_one_sample_per_trial(self):
+        calls = []
+        result = Benchmark(calls.append, (1,), trials=3, warmup=2, loops=4).run()
+        assert len(result.samples) == 3
+        assert result.loops == 4
+        assert len(calls) == 2 + 3 * 4
+
+    def test_keeps_return_value(self):
+        @benchmark(trials=2, loops=1)
+        def square(a):
+            return a * a
+        result = square(3)
+        assert result.return_value == 9
+        assert result.name.endswith('square')
+        assert square.__name__ == 'square'
+
+    def test_calibrate_reaches_min_time(self):
+        loops = Benchmark(sum, ([1, 2, 3],), min_time=0.001).calibrate()
+        assert loops >= 1
+        assert str(loops).strip('0') == '1'
+
+    def test_restores_garbage_collector(self):
+        assert gc.isenabled()
+        Benchmark(sum, ([1, 2, 3],), trials=1, loops=10).run()
+        assert gc.isenabled()
+
+    def test_nested_suspensions_restore_garbage_collector_once(self):
+        with gc_suspended():
+            with gc_suspended():
+                assert not gc.isenabled()
+            assert not gc.isenabled()
+        assert gc.isenabled()
+
+    def test_invalid_trials(self):
+        with pytest.raises(ValueError):
+            Benchmark(sum, trials=0)
+
+
+class TestBaseline:
+    def test_save_and_load(self, tmp_path):
+        path = tmp_path / 'results.json'
+        save_results([BenchmarkResult('f', [1.0, 2.0, 3.0], loops=5)], path)
+        assert json.loads(path.read_text())['f']['median'] == 2.0
+        loaded = load_results(path)
+        assert loaded['f'].samples == [1.0, 2.0, 3.0]
+        assert loaded['f'].loops == 5
+
+    def test_compare_flags_regressions(self):
+        baseline = {
+            'fast': BenchmarkResult('fast', [1.0], 1),
+            'slow': BenchmarkResult('slow', [1.0], 1),
+        }
+        current = [
+            BenchmarkResult('fast', [1.05], 1),
+            BenchmarkResult('slow', [1.5], 1),
+            BenchmarkResult('new', [1.0], 1),
+        ]
+        comparisons = {c.name: c for c in compare(current, baseline, tolerance=0.1)}
+        assert set(comparisons) == {'fast', 'slow'}
+        assert not comparisons['fast'].regressed
+        assert comparisons['slow'].regressed
+        assert comparisons['slow'].ratio == 1.5
+
+
+def test_average_runtime_returns_mean_runtime():
+    calls = []
+    @average_runtime(10)
+    def append_one():
+        calls.append(1)
+    runtime = append_one()
+    assert isinstance(runtime, float)
+    assert runtime >= 0
+    assert len(calls) == 11
+
+
+class TestAsync:
+    def test_benchmark_awaits_coroutines(self):
+        @benchmark(trials=2, loops=3)
+        async def nap(seconds):
+            await asyncio.sleep(seconds)
+            return seconds
+        result = asyncio.run(nap(0.001))
+        assert result.return_value == 0.001
+        assert len(result.samples) == 2
+        assert result.min >= 0.001
+
+    def test_average_runtime_of_coroutine(self):
+        @average_runtime(5)
+        async def nap():
+            await asyncio.sleep(0.001)
+        assert inspect.iscoroutinefunction(nap)
+        assert asyncio.run(nap()) >= 0.001
+
+    def test_overlapping_runs_restore_garbage_collector(self):
+        @benchmark(trials=2, loops=2)
+        async def nap():
+            await asyncio.sleep(0.001)
+        async def main():
+            await asyncio.gather(nap(), nap(), nap())
+        assert gc.isenabled()
+        asyncio.run(main())
+        assert gc.isenabled()
@@ -0,0 +1,31 @@
+import pytest
+
+from ch9.vector2d import Vector2d, ShortVector2d
+from ch10.vector import Vector as Vector10
+from ch13.vector import Vector as Vector13
+from memory import format_report, instance_footprint, memory_report
+
+
+class DictVector2d:
+    def __init__(self, x, y):
+        self.__x = float(x)
+        self.__y = float(y)
+
+
+@pytest.mark.parametrize('instance', [
+    Vector2d(1, 2), ShortVector2d(1, 2), Vector10([1, 2, 3]), Vector13([1, 2, 3])])
+def test_vectors_have_no_instance_dict(instance):
+    assert not hasattr(instance, '__dict__')
+
+
+def test_slots_use_less_memory_than_instance_dict():
+    slotted = instance_footprint(lambda i: Vector2d(i, i), 1000)
+    with_dict = instance_footprint(lambda i: DictVector2d(i, i), 1000)
+    assert 0 < slotted < with_dict
+
+
+def test_memory_report():
+    report = memory_report({'tuple': lambda i: (i, i)}, 100)
+    assert list(report) == ['tuple']
+    assert report['tuple'] > 0
+    assert 'tuple' in format_report(report, 100)
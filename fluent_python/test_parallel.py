@@ -0,0 +1,62 @@
+import pytest
+
+from ch10.vector import Vector as Vector10
+from ch13.vector import Vector as Vector13, ShortVector
+from parallel import parallel_dot, parallel_eq, parallel_hash, parallel_norm
+
+
+def backends():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return ['process']
+    return ['process', 'thread']
+
+
+@pytest.fixture(params=[Vector10, Vector13])
+def vector_class(request):
+    return request.param
+
+
+@pytest.mark.parametrize('backend', backends())
+class TestParallelReductions:
+    def test_norm(self, vector_class, backend):
+        v = vector_class(range(1000))
+        assert parallel_norm(v, workers=3, threshold=0, backend=backend) == pytest.approx(abs(v))
+
+    def test_dot(self, backend):
+        v, w = Vector13(range(1000)), Vector13(range(0, 2000, 2))
+        assert parallel_dot(v, w, workers=3, threshold=0, backend=backend) == v @ w
+        assert parallel_dot(v, w[:10], workers=3, threshold=0, backend=backend) == v @ w[:10]
+
+    def test_eq(self, vector_class, backend):
+        v, w = vector_class(range(1000)), vector_class(range(1000))
+        assert parallel_eq(v, w, workers=3, threshold=0, backend=backend) is True
+        assert parallel_eq(v, w[:10], workers=3, threshold=0, backend=backend) is False
+        w.x = -1
+        assert parallel_eq(v, w, workers=3, threshold=0, backend=backend) is False
+
+    def test_mixed_typecodes(self, backend):
+        v = ShortVector([0.5, 0.25, 2.0])
+        w = Vector13([0.5, 0.25, 2.0])
+        assert parallel_eq(v, w, workers=2, threshold=0, backend=backend) is True
+        assert parallel_norm(v, workers=2, threshold=0, backend=backend) == abs(w)
+
+
+def test_hash(vector_class):
+    v = vector_class(range(5000))
+    assert parallel_hash(v, workers=3, threshold=0) == hash(v)
+    assert parallel_hash(vector_class(range(100)), workers=3, threshold=0) == hash(vector_class(range(100)))
+
+
+def test_serial_below_threshold():
+    v = Vector13([3, 4])
+    assert parallel_norm(v) == 5.0
+    assert parallel_dot(v, v) == 25.0
+    assert parallel_eq(v, Vector13([3, 4])) is True
+    assert parallel_hash(v) == hash(v)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        parallel_norm(Vector13([1, 2]), threshold=0, backend='gpu')
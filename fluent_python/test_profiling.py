@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from profiling import (LatencyHistogram, N_BUCKETS, PENDING_LIMIT, Registry, bucket_index,
+                       bucket_value, measure_overhead, profile)
+
+
+def test_bucket_value_bounds_every_value_within_precision():
+    for ns in [0, 1, 63, 64, 65, 127, 128, 1000, 12345, 10 ** 9, 2 ** 40]:
+        index = bucket_index(ns)
+        assert bucket_value(index) >= ns
+        assert index == 0 or bucket_value(index - 1) < ns
+        assert bucket_value(index) - ns <= ns / 32
+    assert bucket_index(2 ** 60) == N_BUCKETS - 1
+
+
+class TestLatencyHistogram:
+    def test_percentiles(self):
+        h = LatencyHistogram()
+        for ns in range(1, 1001):
+            h.record(ns * 1000)
+        assert h.count == 1000
+        assert h.max_ns == 1_000_000
+        assert h.percentile(50) == pytest.approx(500_000, rel=1 / 32)
+        assert h.percentile(99) == pytest.approx(990_000, rel=1 / 32)
+        assert h.percentile(100) == 1_000_000
+
+    def test_batches_are_bucketed_when_full(self):
+        h = LatencyHistogram()
+        for ns in range(PENDING_LIMIT + 10):
+            h.record(ns)
+        assert len(h._pending) == 10
+        assert h.count == PENDING_LIMIT + 10
+        assert h._pending == []
+        assert h.total_ns == sum(range(PENDING_LIMIT + 10))
+        assert h.max_ns == PENDING_LIMIT + 9
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(99) == 0
+        with pytest.raises(ValueError):
+            LatencyHistogram().percentile(-1)
+
+
+class TestProfile:
+    @pytest.fixture
+    def registry(self):
+        return Registry()
+
+    def test_records_every_call(self, registry):
+        @profile(registry)
+        def square(a):
+            return a * a
+        assert [square(i) for i in range(10)] == [i * i for i in range(10)]
+        stats = registry.snapshot()[square.__qualname__]
+        assert stats['count'] == 10
+        assert 0 < stats['p50_ns'] <= stats['p99_ns'] <= stats['max_ns']
+        assert square.__name__ == 'square'
+
+    def test_records_calls_that_raise(self, registry):
+        @profile(registry, name='fails')
+        def fails():
+            raise KeyError
+        with pytest.raises(KeyError):
+            fails()
+        assert registry.histograms['fails'].count == 1
+
+    def test_dump_json(self, registry, tmp_path):
+        profile(registry, name='f')(lambda: None)()
+        path = tmp_path / 'latency.json'
+        registry.dump_json(path)
+        assert json.loads(path.read_text())['f']['count'] == 1
+
+    def test_dump_prometheus(self, registry, tmp_path):
+        profile(registry, name='f')(lambda: None)()
+        path = tmp_path / 'latency.prom'
+        registry.dump_prometheus(path)
+        text = path.read_text()
+        assert 'function_latency_seconds{function="f",quantile="0.99"}' in text
+        assert 'function_latency_seconds_count{function="f"} 1' in text
+        assert 'function_latency_max_seconds{function="f"}' in text
+
+
+def test_overhead_is_under_a_microsecond():
+    # the best of a few runs, to ride out noise from other processes
+    assert min(measure_overhead(trials=5, loops=20_000) for _ in range(3)) < 1e-6
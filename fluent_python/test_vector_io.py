@@ -0,0 +1,94 @@
+import pytest
+
+from ch9.vector2d import Vector2d, ShortVector2d
+from ch10.vector import Vector as Vector10, ShortVector
+from ch13.vector import Vector as Vector13
+from vector_io import dump_many, load_many
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / 'vectors.bin'
+
+
+@pytest.mark.parametrize('cls', [Vector10, Vector13])
+def test_round_trip_variable_length(path, cls):
+    vectors = [cls([1, 2, 3]), cls([]), cls([4.5]), cls(range(100))]
+    dump_many(vectors, path)
+    with load_many(path, cls) as loaded:
+        assert loaded.width == 0
+        assert len(loaded) == 4
+        assert list(loaded) == vectors
+        assert [len(v) for v in loaded] == [3, 0, 1, 100]
+        assert loaded[-1] == vectors[-1]
+        assert all(type(v) is cls for v in loaded)
+
+
+def test_round_trip_fixed_width(path):
+    vectors = [Vector2d(i, -i) for i in range(10)]
+    dump_many(vectors, path)
+    with load_many(path, Vector2d) as loaded:
+        assert loaded.width == 2
+        assert list(loaded) == vectors
+        assert loaded[2:4] == vectors[2:4]
+    assert path.stat().st_size == 24 + 10 * 2 * 8
+
+
+def test_single_precision(path):
+    dump_many([ShortVector2d(1, 2), ShortVector2d(3, 4)], path)
+    with load_many(path, ShortVector2d) as loaded:
+        assert loaded.typecode == 'f'
+        assert list(loaded) == [ShortVector2d(1, 2), ShortVector2d(3, 4)]
+    dump_many([ShortVector([1/3]), ShortVector([1, 2])], path)
+    with load_many(path, ShortVector) as loaded:
+        v = loaded[0]
+        assert v == ShortVector([1/3])
+        del v
+
+
+def test_loaded_vectors_are_copied_on_write(path):
+    dump_many([Vector10([1, 2]), Vector10([3])], path)
+    loaded = load_many(path, Vector10)
+    v = loaded[0]
+    assert isinstance(v._components, memoryview)
+    v.x = 10
+    assert v == Vector10([10, 2])
+    assert loaded[0] == Vector10([1, 2])
+    del v
+    loaded.close()
+
+
+def test_empty(path):
+    dump_many([], path)
+    with load_many(path, Vector10) as loaded:
+        assert len(loaded) == 0
+        assert list(loaded) == []
+
+
+def test_index_out_of_range(path):
+    dump_many([Vector10([1])], path)
+    with load_many(path, Vector10) as loaded:
+        with pytest.raises(IndexError):
+            loaded[1]
+
+
+def test_rejects_other_files(path):
+    path.write_bytes(b'not a vector file at all')
+    with pytest.raises(ValueError):
+        load_many(path, Vector10)
+    path.write_bytes(b'FPVC')
+    with pytest.raises(ValueError):
+        load_many(path, Vector10)
+    dump_many([Vector10([1, 2]), Vector10([3])], path)
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError):
+        load_many(path, Vector10)
+
+
+def test_rejects_other_typecodes(path):
+    dump_many([Vector10([1, 2])], path)
+    with pytest.raises(ValueError):
+        load_many(path, ShortVector)
+    dump_many([ShortVector2d(1, 2)], path)
+    with pytest.raises(ValueError):
+        load_many(path, Vector2d)
@@ -1,17 +1,27 @@
+import inspect
 from functools import wraps
-from time import perf_counter
 
+from benchmark import Benchmark
 
-def average_runtime(n_trials):
+
+def average_runtime(n_trials, warmup=1, disable_gc=True):
+    """Decorator that returns the mean runtime of n_trials calls in seconds.
+
+    Coroutine functions become coroutine functions that await n_trials calls.
+    """
     def decorator(f):
+        def make(args, kwargs):
+            return Benchmark(
+                f, args, kwargs, trials=1, loops=n_trials, warmup=warmup,
+                disable_gc=disable_gc)
+        if inspect.iscoroutinefunction(f):
+            @wraps(f)
+            async def inner_async(*args, **kwargs):
+                return (await make(args, kwargs).run_async()).mean
+            return inner_async
+
         @wraps(f)
         def inner(*args, **kwargs):
-            nonlocal n_trials
-            start = perf_counter()
-            for _ in range(n_trials):
-                f(*args, **kwargs)
-            end = perf_counter()
-            return (end - start) / n_trials
+            return make(args, kwargs).run().mean
         return inner
     return decorator
-        
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""Bulk serialization of Vector and Vector2d collections.
+
+A file holds a fixed header, then the component offsets of every vector,
+then the components of all the vectors as one contiguous block of raw
+machine values:
+
+    magic (4s) | version (B) | typecode (c) | padding (2x) | count (Q) | width (Q)
+    offsets: count + 1 unsigned 64 bit component indices, omitted if width > 0
+    components: raw items of the given typecode
+
+When all the vectors have the same number of components, like Vector2d
+collections, the file stores that width instead of the offsets. Both the
+header and the offsets are multiples of 8 bytes long, so the components
+are always aligned.
+
+load_many maps the file into memory instead of reading it, and builds
+vectors lazily as views over the mapping, so opening a file costs the
+same whatever its size.
+"""
+import mmap
+import struct
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+
+MAGIC = b'FPVC'
+VERSION = 1
+_HEADER = struct.Struct('=4sBcxxQQ')
+
+
+def _components_of(vector, typecode):
+    # the array a vector already holds, when it has the right typecode
+    components = getattr(vector, '_components', None)
+    if components is not None and memoryview(components).format == typecode:
+        return components
+    return array(typecode, vector)
+
+
+def dump_many(vectors, path, typecode=None) -> None:
+    """Writes a collection of vectors to path.
+
+    typecode defaults to the typecode of the first vector, or 'd'.
+    """
+    vectors = list(vectors)
+    if typecode is None:
+        typecode = getattr(vectors[0], 'typecode', 'd') if vectors else 'd'
+    blocks = [_components_of(v, typecode) for v in vectors]
+    lengths = [len(b) for b in blocks]
+    width = lengths[0] if lengths and lengths.count(lengths[0]) == len(lengths) else 0
+    with open(path, 'wb') as fp:
+        fp.write(_HEADER.pack(MAGIC, VERSION, typecode.encode(), len(vectors), width))
+        if not width:
+            fp.write(array('Q', accumulate(lengths, initial=0)))
+        for block in blocks:
+            fp.write(block)
+
+
+class VectorFile(Sequence):
+    """Read-only sequence of the vectors in a file written by dump_many.
+
+    Vectors of classes with a frombuffer constructor are views over the
+    mapped file, marked as shared so that a shortcut write first copies
+    their components into a new array. Other classes, like Vector2d, are
+    built from the components. A cls with a typecode must match the one
+    the file was written with. The file can only be closed once no vector
+    loaded from it is alive.
+    """
+    def __init__(self, path, cls):
+        self.cls = cls
+        with open(path, 'rb') as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = self.components = None
+        try:
+            self._open()
+        except (ValueError, TypeError, struct.error):
+            self.close()
+            raise ValueError(f'{path} is not a valid version {VERSION} vector file.') from None
+        expected = getattr(cls, 'typecode', self.typecode)
+        if self.typecode != expected:
+            self.close()
+            raise ValueError(f'{path} holds {self.typecode!r} items, '
+                             f'{cls.__name__} expects {expected!r}.')
+        self._frombuffer = getattr(cls, 'frombuffer', None)
+
+    def _open(self):
+        magic, version, typecode, count, width = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(magic, version)
+        self.typecode = typecode.decode()
+        self.width = width
+        self._count = count
+        with memoryview(self._mmap) as memv:
+            start = _HEADER.size
+            if width:
+                n_components = count * width
+            else:
+                self._offsets = memv[start:start + 8 * (count + 1)].cast('Q')
+                start += self._offsets.nbytes
+                n_components = self._offsets[count]
+            self.components = memv[start:].cast(self.typecode)
+            if len(self.components) < n_components:
+                raise ValueError(len(self.components), n_components)
+
+    def __len__(self):
+        return self._count
+
+    def _bounds(self, index):
+        if self._offsets is None:
+            start = index * self.width
+            return start, start + self.width
+        return self._offsets[index], self._offsets[index + 1]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('VectorFile index out of range')
+        start, stop = self._bounds(index)
+        components = self.components[start:stop]
+        if self._frombuffer is None:
+            return self.cls(*components)
+        vector = self._frombuffer(components)
+        vector._shared = True
+        return vector
+
+    def close(self):
+        for memv in (self._offsets, self.components):
+            if memv is not None:
+                memv.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_many(path, cls) -> VectorFile:
+    """Opens a file written by dump_many as a sequence of cls instances"""
+    return VectorFile(path, cls)